@@ -15,6 +15,13 @@ from projspec.config import temp_conf
 context = {}
 
 
+def _library():
+    """The project library: the one kept in memory when running in a daemon"""
+    from projspec.library import ProjectLibrary
+
+    return context.get("library") or ProjectLibrary()
+
+
 @click.group()
 def main():
     pass
@@ -98,6 +105,22 @@ def version():
 @click.option(
     "--walk", is_flag=True, help="Descend into child directories of each match"
 )
+@click.option(
+    "--depth",
+    type=int,
+    default=None,
+    help="Descend at most this many levels into child directories (implies --walk)",
+)
+@click.option(
+    "--stop-at-terminal",
+    is_flag=True,
+    help="Don't descend below directories matching terminal specs, e.g., python libraries",
+)
+@click.option(
+    "--respect-gitignore",
+    is_flag=True,
+    help="Skip directories and files ignored by git while walking",
+)
 @click.option("--summary", is_flag=True, help="Show abbreviated output")
 @click.option("--library", is_flag=True, help="Add each result to the library")
 def scan(
@@ -107,6 +130,9 @@ def scan(
     xtypes,
     json_out,
     walk,
+    depth,
+    stop_at_terminal,
+    respect_gitignore,
     summary,
     library,
 ):
@@ -124,6 +150,8 @@ def scan(
         types = None
     else:
         types = types.split(",")
+    if depth is not None:
+        walk = depth
 
     for pattern in patterns or (".",):
         for proj in scan_glob(
@@ -132,7 +160,10 @@ def scan(
             xtypes=xtypes,
             walk=walk,
             storage_options=storage_options,
-            add_to_library=library,
+            add_to_library=_library() if library else False,
+            stop_at_terminal=stop_at_terminal,
+            # unset flag falls back to the config value
+            respect_gitignore=respect_gitignore or None,
         ):
             if summary:
                 print(proj.text_summary())
@@ -225,27 +256,19 @@ def library():
 )
 def list(json_out):
     """Show contents of the library"""
-    from projspec.library import ProjectLibrary
-
-    library = ProjectLibrary()
+    library = _library()
+    # straight from the stored form; no need to rehydrate the projects
     if json_out:
-        print(
-            json.dumps(
-                {k: v.to_dict(compact=False) for k, v in library.entries.items()}
-            )
-        )
+        print(json.dumps({k: library.entries.raw(k) for k in library.entries}))
     else:
         for url in sorted(library.entries):
-            proj = library.entries[url]
-            print(f"{proj.text_summary(bare=True)}")
+            print(library.entries.summary(url))
 
 
 @library.command("clear")
 def clear():
     """Clear all contents of the library"""
-    from projspec.library import ProjectLibrary
-
-    ProjectLibrary().clear()
+    _library().clear()
 
 
 @library.command("delete")
@@ -255,11 +278,32 @@ def delete(url):
 
     URL must be given as shows in `list`.
     """
-    from projspec.library import ProjectLibrary
+    _library().delete(url)
+
 
-    library = ProjectLibrary()
-    library.entries.pop(url)
-    library.save()
+@main.command("serve")
+@click.option(
+    "--stdio",
+    is_flag=True,
+    help="Answer requests on stdin/stdout, rather than on a local socket",
+)
+@click.option("--port", default=0, help="Socket port; by default, any free one")
+def serve(stdio, port):
+    """Run a projspec daemon, answering JSON-RPC requests.
+
+    The daemon keeps the spec registry, config and library in memory. While
+    it runs (in socket mode), other projspec commands such as "scan",
+    "info" and "library" are forwarded to it. See projspec.server.
+    """
+    from projspec import server
+
+    if stdio:
+        server.serve_stdio()
+    else:
+        srv = server.make_server(port=port)
+        host, port = srv.server_address[:2]
+        print(f"projspec daemon listening on {host}:{port}", file=sys.stderr)
+        server.serve_socket(srv)
 
 
 @main.group("config")
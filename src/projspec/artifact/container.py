@@ -54,6 +54,8 @@ class Docker(ProjectExtra):
 
     icon = "🐳"
 
+    marker_files = {"Dockerfile"}
+
     def match(self):
         return "Dockerfile" in self.proj.basenames
 
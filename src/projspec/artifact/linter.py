@@ -19,6 +19,8 @@ class PreCommitted(ProjectExtra):
 
     icon = "✅"
 
+    marker_files = {".pre-commit-config.yaml"}
+
     def match(self):
         return ".pre-commit-config.yaml" in self.proj.basenames
 
@@ -34,9 +34,13 @@ def defaults():
     return {
         "library_path": f"{conf_dir()}/library.json",
         "auto_rescan": 7 * 24 * 60 * 60,  # one week, in seconds
+        "auto_rescan_workers": 8,
+        "auto_rescan_timeout": 60.0,
+        "auto_rescan_background": False,
         "scan_types": [".py", ".yaml", ".yml", ".toml", ".json", ".md"],
         "scan_max_files": 100,
         "scan_max_size": 5 * 2**10,
+        "scan_workers": 0,
         "remote_artifact_status": False,
         "capture_artifact_output": True,
         "preferred_install_methods": ["conda", "pip"],
@@ -58,19 +62,42 @@ def defaults():
             "target",
             "venv",
         ],
+        "respect_gitignore": False,
+        "scan_cache": False,
     }
 
 
 config_doc = {
-    "library_path": "location of persisted project objects",
+    "library_path": (
+        "location of persisted project objects. If the extension is .db, .sqlite "
+        "or .sqlite3, a SQLite database is used; otherwise a JSON file."
+    ),
     "auto_rescan": (
         "maximum age (seconds) of a project loaded from the library before it "
         "is automatically rescanned and re-saved. Set to 0 to disable "
         "automatic rescanning. Default is one week."
     ),
+    "auto_rescan_workers": (
+        "maximum number of library entries automatically rescanned at once"
+    ),
+    "auto_rescan_timeout": (
+        "seconds after which the automatic rescan of a library entry is "
+        "abandoned, keeping the stored data. 0 means no limit."
+    ),
+    "auto_rescan_background": (
+        "if True, loading the library returns the stored entries immediately, "
+        "and stale ones are replaced (and saved) when their rescan finishes, "
+        "in a background thread."
+    ),
     "scan_types": "files extensions automatically read for scanning",
     "scan_max_files": "don't scan files if more than this number in the project",
     "scan_max_size": "don't scan files bigger than this (in bytes)",
+    "scan_workers": (
+        "number of threads used to resolve sibling child directories "
+        "concurrently when walking a project tree. Mostly useful for remote or "
+        "network filesystems, where the walk is dominated by I/O latency. 0 or 1 "
+        "means resolve children serially."
+    ),
     "remote_artifact_status": "whether to check status for remote artifacts",
     "capture_artifact_output": (
         "if True, capture and enqueue output from spawned Process artifacts. "
@@ -113,6 +140,16 @@ config_doc = {
         "and file statistics. Directories whose names start with '.' or '_' are "
         "always skipped regardless of this setting."
     ),
+    "respect_gitignore": (
+        "if True, also skip directories and files ignored by git (according to "
+        "the .gitignore files of the enclosing repository) when walking a project "
+        "tree for child projects and file statistics."
+    ),
+    "scan_cache": (
+        "if True, store the specs parsed for each scanned directory (in "
+        "scan_cache/ within the config directory) and reuse them when the "
+        "directory's listing (names, sizes, modification times) is unchanged."
+    ),
 }
 
 
@@ -52,6 +52,8 @@ class PythonRequirements(ProjectExtra):
     icon = "📋"
     spec_doc = "https://pip.pypa.io/en/stable/reference/requirements-file-format/"
 
+    marker_files = {"requirements.txt"}
+
     def match(self) -> bool:
         return "requirements.txt" in self.proj.basenames
 
@@ -75,6 +77,8 @@ class CondaEnv(ProjectExtra):
         "manage-environments.html#create-env-file-manually"
     )
 
+    marker_files = {"environment.yaml", "environment.yml"}
+
     def match(self) -> bool:
         return (
             "environment.yaml" in self.proj.basenames
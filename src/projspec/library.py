@@ -1,18 +1,152 @@
 import json
+import logging
+import math
 import os
+import queue
+import threading
 import time
+from collections.abc import MutableMapping
+from contextlib import closing, contextmanager
+from itertools import chain
 
 import fsspec
 
 from projspec.config import get_conf
 from projspec.proj import Project
-from projspec.utils import DEFAULT
+from projspec.utils import DEFAULT, camel_to_snake, get_cls
+
+logger = logging.getLogger("projspec")
+
+
+class LazyEntries(MutableMapping):
+    """Library entries, kept in their serialised form until accessed
+
+    Acts as a ``dict[str, Project]``, but a stored entry is only rehydrated into
+    a :class:`Project` (with all its specs, contents and artifacts) when it is
+    first looked up. Until then, metadata such as the URL or text summary can be
+    had from the stored dict with :meth:`raw` and :meth:`summary`.
+
+    Also keeps track of which entries were changed since they were last loaded
+    or saved, so that only those need be serialised again.
+    """
+
+    def __init__(self, saved: dict[str, dict] | None = None):
+        # key -> serialised form, as last loaded or saved
+        self.saved: dict[str, dict] = dict(saved or {})
+        # key -> Project, for the entries accessed or set so far
+        self.projects: dict[str, Project] = {}
+        # key -> (project, scanned_at) as it was when loaded or saved
+        self._marks: dict[str, tuple[Project, float | None]] = {}
+        # all current keys, in order
+        self._keys: dict[str, None] = dict.fromkeys(self.saved)
+
+    def __getitem__(self, key: str) -> Project:
+        if key in self.projects:
+            return self.projects[key]
+        if key not in self._keys:
+            raise KeyError(key)
+        proj = Project.from_dict(self.saved[key])
+        self.projects[key] = proj
+        self._marks[key] = (proj, proj.scanned_at)
+        return proj
+
+    def __setitem__(self, key: str, proj: Project):
+        self.projects[key] = proj
+        self._keys[key] = None
+
+    def __delitem__(self, key: str):
+        del self._keys[key]
+        self.projects.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __repr__(self):
+        return f"<LazyEntries: {len(self)} entries, {len(self.projects)} loaded>"
+
+    def is_hydrated(self, key: str) -> bool:
+        return key in self.projects
+
+    def _is_changed(self, key: str) -> bool:
+        proj = self.projects.get(key)
+        if proj is None:
+            # never hydrated, so as stored
+            return False
+        mark = self._marks.get(key)
+        return (
+            key not in self.saved
+            or mark is None
+            or mark[0] is not proj
+            or mark[1] != getattr(proj, "scanned_at", None)
+        )
+
+    def changed(self) -> set[str]:
+        """Keys which were added, replaced or rescanned since loaded or saved"""
+        return {key for key in self.projects if self._is_changed(key)}
+
+    def removed(self) -> set[str]:
+        """Keys which were deleted since loaded or saved"""
+        return set(self.saved) - set(self._keys)
+
+    def raw(self, key: str) -> dict:
+        """The serialised form of the given entry, without hydrating it if stored"""
+        if key in self._keys and not self._is_changed(key):
+            return self.saved[key]
+        return self[key].to_dict(compact=False)
+
+    def scanned_at(self, key: str) -> float | None:
+        """When the given entry was last scanned, without hydrating it"""
+        if key in self.projects:
+            return getattr(self.projects[key], "scanned_at", None)
+        try:
+            return float(self.saved[key].get("scanned_at"))
+        except (TypeError, ValueError):
+            return None
+
+    def summary(self, key: str) -> str:
+        """As ``Project.text_summary(bare=True)``, without hydrating the entry"""
+        if key in self.projects:
+            return self.projects[key].text_summary(bare=True)
+        dic = self.saved[key]
+        top = chain(
+            dic.get("specs", {}).values(),
+            dic.get("contents", {}).values(),
+            dic.get("artifacts", {}).values(),
+        )
+        bits = [f" /: {' '.join(_raw_type_name(_) for _ in top)}"] + [
+            f" {k}: {' '.join(_raw_type_name(_) for _ in v.get('specs', {}).values())}"
+            for k, v in dic.get("children", {}).items()
+        ]
+        return dic.get("url", key) + "\n".join(bits)
+
+    def mark_saved(self, saved: dict[str, dict]):
+        """Record that the given serialised entries are now what is stored"""
+        self.saved = saved
+        self._marks = {
+            key: (proj, getattr(proj, "scanned_at", None))
+            for key, proj in self.projects.items()
+        }
 
 
 class ProjectLibrary:
-    """Stores scanned project objects at a given path in JSON format
+    """Stores scanned project objects at a given path
+
+    The storage format is chosen by the extension of the path: ".db", ".sqlite"
+    or ".sqlite3" give a SQLite database (see :class:`SQLiteStore`), which can
+    update, delete and filter single entries without rewriting or reading the
+    whole library; anything else is a single JSON file (see :class:`JSONStore`).
 
-    In the future, alternative serialisations will be implemented.
+    Entries are only rehydrated into Project objects when accessed; see
+    :class:`LazyEntries`.
+
+    To add many entries with a single write, rather than one per entry, use
+    :meth:`transaction`.
     """
 
     # TODO: support for remote libraries
@@ -22,31 +156,52 @@ class ProjectLibrary:
         library_path: str | None | type = DEFAULT,
         auto_save: bool = True,
         entries: dict | None = None,
+        background_rescan: bool | None = None,
     ):
+        """
+
+        :param library_path: location of the stored library; if None, entries are
+            held in memory only. Defaults to the ``library_path`` config value.
+        :param auto_save: whether to store the library whenever an entry is added
+            or deleted.
+        :param entries: initial entries, mapping keys to Project objects.
+        :param background_rescan: whether stale entries are rescanned in a
+            background thread, rather than before ``load()`` returns. If None,
+            uses the ``auto_rescan_background`` config value.
+        """
         self.path = (
             get_conf("library_path") if library_path is DEFAULT else library_path
         )
-        self.entries: dict[str, Project] = {} if entries is None else entries
+        self.store = None if self.path is None else _store_for(self.path)
+        self.entries: LazyEntries = LazyEntries()
+        self.entries.update(entries or {})
         self.auto_save = auto_save
+        self.background_rescan = (
+            get_conf("auto_rescan_background")
+            if background_rescan is None
+            else background_rescan
+        )
+        self._batch_depth = 0
+        self._dirty = False
+        # guards against saving from the user's and a background rescan thread at once
+        self._lock = threading.RLock()
+        self._rescan_thread: threading.Thread | None = None
         self.load()
 
     def load(self):
-        """Loads scanned project objects from JSON file.
+        """Loads scanned project objects from storage.
 
         Any entry whose last scan is older than the ``auto_rescan`` config
         value (in seconds) is automatically rescanned and the refreshed
         library is saved back. Set ``auto_rescan`` to 0 to disable this.
+        If background rescanning is enabled, this returns immediately with the
+        stored data, and refreshed entries replace them when ready; see
+        :meth:`wait_rescan`.
         """
-        if self.path is None:
-            return
-        try:
-            with fsspec.open(self.path, "r") as f:
-                self.entries = {
-                    k: Project.from_dict(v) for k, v in json.load(f).items()
-                }
-        except FileNotFoundError:
-            self.entries = {}
+        if self.store is None:
             return
+        self.entries = LazyEntries(self.store.load())
+        self._dirty = False
         self._auto_rescan()
 
     def _auto_rescan(self):
@@ -55,49 +210,139 @@ class ProjectLibrary:
         if not max_age or max_age <= 0:
             return
         now = time.time()
-        rescanned = False
-        for key, proj in list(self.entries.items()):
-            scanned_at = getattr(proj, "scanned_at", None)
+        stale = {}
+        for key in list(self.entries):
+            scanned_at = self.entries.scanned_at(key)
             if scanned_at is None or (now - scanned_at) < max_age:
                 continue
-            try:
-                # Rescan from the project's own path, preserving the library
-                # key so the entry's identity does not drift.
-                fresh = Project(
-                    proj.path,
-                    storage_options=proj.storage_options,
-                    walk=False,
-                )
-            except Exception:
-                # never let an unreachable/changed project break library load
-                continue
-            self.entries[key] = fresh
-            rescanned = True
-        if rescanned and self.auto_save and self.path is not None:
-            self.save()
+            stale[key] = self.entries.raw(key)
+        if not stale:
+            return
+        if self.background_rescan:
+            self._rescan_thread = threading.Thread(
+                target=self._apply_rescan, args=(stale,), daemon=True
+            )
+            self._rescan_thread.start()
+        else:
+            self._apply_rescan(stale)
+
+    def _apply_rescan(self, stale: dict[str, dict]):
+        """Rescan the given entries, and replace them if not changed meanwhile"""
+        fresh = _rescan(
+            stale, get_conf("auto_rescan_workers"), get_conf("auto_rescan_timeout")
+        )
+        with self._lock:
+            rescanned = False
+            for key, proj in fresh.items():
+                # the entry's library key is preserved, so its identity does not
+                # drift; skip any that were deleted or replaced in the meantime
+                if key in self.entries and self.entries.raw(key) is stale[key]:
+                    self.entries[key] = proj
+                    rescanned = True
+            if rescanned and self.auto_save and self.path is not None:
+                self._save_or_defer()
+
+    def wait_rescan(self, timeout: float | None = None) -> bool:
+        """Wait for any background rescan to finish; return whether it has"""
+        if self._rescan_thread is not None:
+            self._rescan_thread.join(timeout)
+            return not self._rescan_thread.is_alive()
+        return True
 
     def clear(self):
-        """Clears scanned project objects from JSON file and memory"""
-        if os.path.isfile(self.path):
-            os.unlink(self.path)
-        self.entries = {}
+        """Clears scanned project objects from storage and memory"""
+        self.store.clear()
+        self.entries = LazyEntries()
+        self._dirty = False
 
     def add_entry(self, path: str, entry: Project):
         """Adds an entry to the scanned project object"""
         self.entries[path] = entry
+        self._dirty = True
+        if self.auto_save:
+            self._save_or_defer()
+
+    def get(self, key: str, default=None) -> Project | None:
+        """The entry of the given key, if present"""
+        return self.entries.get(key, default)
+
+    def delete(self, key: str):
+        """Remove the entry of the given key, raising KeyError if not present"""
+        del self.entries[key]
+        self._dirty = True
         if self.auto_save:
+            self._save_or_defer()
+
+    @contextmanager
+    def transaction(self):
+        """Defer saving until the end of the block, to write only once.
+
+        Within the block, ``add_entry`` (and automatic rescans) do not write the
+        library file; if any of them would have, the library is saved once on
+        exit, even if the block raised. Transactions may be nested, in which case
+        the outermost one saves.
+
+        >>> with library.transaction():
+        ...     for proj in projects:
+        ...         library.add_entry(proj.url, proj)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.save()
+
+    def _save_or_defer(self):
+        if self._batch_depth:
+            self._dirty = True
+        else:
             self.save()
 
     def save(self):
-        """Serialise the state of the scanned project objects to file"""
+        """Serialise the state of the scanned project objects to storage
+
+        Only entries which were added, replaced or rescanned since the library was
+        last loaded or saved are serialised again, and only those (and deleted
+        ones) are written, if the storage supports it.
+        """
         # don't catch
-        if self.path is None:
+        if self.store is None:
             raise ValueError("Cannot save without .path set")
-        data = {k: v.to_dict(compact=False) for k, v in self.entries.items()}
-        with fsspec.open(self.path, "w") as f:
-            json.dump(data, f)
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        changed = self.entries.changed()
+        removed = self.entries.removed()
+        data = {
+            k: (
+                self.entries.projects[k].to_dict(compact=False)
+                if k in changed
+                else self.entries.saved[k]
+            )
+            for k in self.entries
+        }
+        self.store.save(data, changed, removed)
+        self.entries.mark_saved(data)
+        self._dirty = False
 
     def filter(self, filters: list[tuple[str, str]]) -> dict[str, Project]:
+        """Entries matching all the given (category, value) filters
+
+        Categories are "spec", "artifact" and "content"; a value may be a tuple of
+        names, any of which may match.
+        """
+        in_sync = (
+            not self._dirty
+            and self.store is not None
+            and not self.entries.changed()
+            and not self.entries.removed()
+        )
+        keys = self.store.query(filters) if in_sync else None
+        if keys is not None:
+            return {k: self.entries[k] for k in self.entries if k in keys}
         return {k: v for k, v in self.entries.items() if _match(v, filters)}
 
     # ------------------------------------------------------------------
@@ -155,15 +400,229 @@ class ProjectLibrary:
         display(widget)
 
 
+def _rescan(stale: dict[str, dict], workers: int, timeout: float) -> dict:
+    """Scan the projects of the given serialised entries afresh, concurrently
+
+    At most ``workers`` scans run at once. A scan still running after ``timeout``
+    seconds (if positive) is abandoned: its result, if it ever comes, is ignored,
+    and its slot is given to the next entry. Entries that fail or time out are
+    left out of the returned ``{key: Project}``.
+    """
+    todo = list(stale.items())
+    finished = queue.Queue()
+    running: dict[str, float] = {}  # key -> deadline
+    results = {}
+
+    def scan(key, dic):
+        try:
+            proj = Project(
+                dic["url"], storage_options=dic["storage_options"], walk=False
+            )
+        except Exception:
+            # never let an unreachable/changed project break library load
+            logger.debug("Failed to rescan %s", key, exc_info=True)
+            proj = None
+        finished.put((key, proj))
+
+    while todo or running:
+        while todo and len(running) < max(workers, 1):
+            key, dic = todo.pop(0)
+            running[key] = time.monotonic() + timeout if timeout > 0 else math.inf
+            # daemon, so that a hung scan never blocks interpreter exit
+            threading.Thread(target=scan, args=(key, dic), daemon=True).start()
+        wait = min(running.values()) - time.monotonic()
+        try:
+            key, proj = finished.get(timeout=max(wait, 0) if wait < math.inf else None)
+        except queue.Empty:
+            now = time.monotonic()
+            for key in [k for k, deadline in running.items() if deadline <= now]:
+                logger.warning("Timed out rescanning %s", key)
+                del running[key]
+            continue
+        if running.pop(key, None) is not None and proj is not None:
+            results[key] = proj
+    return results
+
+
 # move to Project definition?
 def _match(proj: Project, filters: list[tuple[str, str | tuple[str]]]) -> bool:
-    # TODO: this is all AND, but you can get OR by passing a tuple of values
+    # this is all AND, but you can get OR by passing a tuple of values
     for cat, value in filters:
+        values = value if isinstance(value, tuple) else (value,)
         # TODO: make categories an enum
-        if cat == "spec" and value not in proj:
+        if cat == "spec" and not any(v in proj for v in values):
             return False
-        if cat == "artifact" and not proj.all_artifacts(value):
+        if cat == "artifact" and not proj.all_artifacts(values):
             return False
-        if cat == "content" and not proj.all_contents(value):
+        if cat == "content" and not proj.all_contents(values):
             return False
     return True
+
+
+def _index_terms(dic: dict) -> set[tuple[str, str]]:
+    """The (category, name) pairs of a serialised project that _match can select on
+
+    These are the names of the specs, artifacts and contents anywhere in the
+    project or its children.
+    """
+    terms = set()
+
+    def classes(obj, category):
+        # the serialised instances of the given category within obj
+        if isinstance(obj, dict):
+            klass = obj.get("klass")
+            if isinstance(klass, list) and klass[0] == category:
+                terms.add((category, klass[1]))
+            else:
+                for v in obj.values():
+                    classes(v, category)
+        elif isinstance(obj, list):
+            for v in obj:
+                classes(v, category)
+
+    def visit(proj):
+        specs = proj.get("specs", {})
+        terms.update(("spec", name) for name in specs)
+        for spec in specs.values():
+            classes(spec.get("_contents"), "content")
+            classes(spec.get("_artifacts"), "artifact")
+        classes(proj.get("contents"), "content")
+        classes(proj.get("artifacts"), "artifact")
+        for child in proj.get("children", {}).values():
+            visit(child)
+
+    visit(dic)
+    return terms
+
+
+def _raw_type_name(obj) -> str:
+    """Class name of the object the given serialised value would rehydrate to"""
+    if isinstance(obj, dict):
+        klass = obj.get("klass")
+        if isinstance(klass, list):
+            try:
+                return get_cls(klass[1], klass[0]).__name__
+            except KeyError:
+                return klass[1]
+        return "AttrDict"
+    return type(obj).__name__
+
+
+def _store_for(path: str):
+    if path.rsplit(".", 1)[-1].lower() in SQLiteStore.extensions:
+        return SQLiteStore(path)
+    return JSONStore(path)
+
+
+class JSONStore:
+    """All library entries in a single JSON file, rewritten on each save"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict[str, dict]:
+        try:
+            with fsspec.open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, data: dict[str, dict], changed: set[str], removed: set[str]):
+        """Store the given entries, of which the listed ones changed or were removed"""
+        with fsspec.open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def query(self, filters) -> set[str] | None:
+        """Keys matching filters, or None if this must be done on the entries"""
+        return None
+
+    def clear(self):
+        if os.path.isfile(self.path):
+            os.unlink(self.path)
+
+
+class SQLiteStore:
+    """Library entries in a (local) SQLite database, one row per project
+
+    Each project's JSON is kept in a blob column, with its URL and scan time as
+    indexed columns, and the names of its specs, artifacts and contents in an
+    indexed side table, so that entries can be saved, deleted and filtered
+    individually.
+    """
+
+    extensions = ("db", "sqlite", "sqlite3")
+    schema = """
+    CREATE TABLE IF NOT EXISTS projects (
+        key TEXT PRIMARY KEY, url TEXT, scanned_at REAL, data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS projects_url ON projects (url);
+    CREATE INDEX IF NOT EXISTS projects_scanned_at ON projects (scanned_at);
+    CREATE TABLE IF NOT EXISTS terms (
+        category TEXT NOT NULL, name TEXT NOT NULL, key TEXT NOT NULL,
+        PRIMARY KEY (category, name, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS terms_key ON terms (key);
+    """
+
+    def __init__(self, path: str):
+        fs, self.path = fsspec.url_to_fs(path)
+        if not isinstance(fs, fsspec.implementations.local.LocalFileSystem):
+            raise ValueError(f"SQLite library must be a local file, got {path}")
+
+    def _connect(self):
+        import sqlite3
+
+        con = sqlite3.connect(self.path)
+        con.executescript(self.schema)
+        return closing(con)
+
+    def load(self) -> dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        with self._connect() as con:
+            rows = con.execute("SELECT key, data FROM projects").fetchall()
+        return {key: json.loads(data) for key, data in rows}
+
+    def save(self, data: dict[str, dict], changed: set[str], removed: set[str]):
+        """Write the changed entries and delete the removed ones"""
+        if not changed and not removed and os.path.exists(self.path):
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as con, con:
+            gone = [(key,) for key in changed | removed]
+            con.executemany("DELETE FROM projects WHERE key = ?", gone)
+            con.executemany("DELETE FROM terms WHERE key = ?", gone)
+            for key in changed:
+                dic = data[key]
+                con.execute(
+                    "INSERT INTO projects VALUES (?, ?, ?, ?)",
+                    (key, dic.get("url"), dic.get("scanned_at"), json.dumps(dic)),
+                )
+                con.executemany(
+                    "INSERT INTO terms VALUES (?, ?, ?)",
+                    [(cat, name, key) for cat, name in _index_terms(dic)],
+                )
+
+    def query(self, filters) -> set[str] | None:
+        """Keys matching all filters, found from the index"""
+        clauses = []
+        params = []
+        for cat, value in filters:
+            values = value if isinstance(value, tuple) else (value,)
+            if cat not in ("spec", "artifact", "content"):
+                # not indexed; leave this filter to _match
+                return None
+            clauses.append(
+                "key IN (SELECT key FROM terms WHERE category = ? AND name IN (%s))"
+                % ", ".join("?" * len(values))
+            )
+            params.extend([cat] + [camel_to_snake(v) for v in values])
+        sql = "SELECT key FROM projects"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._connect() as con:
+            return {key for (key,) in con.execute(sql, params)}
+
+    def clear(self):
+        if os.path.isfile(self.path):
+            os.unlink(self.path)
@@ -0,0 +1,102 @@
+"""On-disk cache of the specs resolved for each directory.
+
+Rescanning an unchanged directory would repeat every file read and every parse.
+Instead, the serialised result of resolving a directory (its specs, and the
+contents/artifacts contributed by extras) is stored alongside a fingerprint of
+the directory's listing - the names, sizes and modification times (or ETags) of
+its entries. When the fingerprint is unchanged, the stored result is rehydrated
+rather than parsing again; a changed directory is parsed afresh and its entry
+replaced. Each directory has its own entry, so walking a tree only re-parses
+the directories that changed.
+
+Only the directory's own listing is fingerprinted: a spec that reads files in
+subdirectories (e.g., CI workflows) sees their changes only when the listing of
+the directory itself changes too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from projspec.config import conf_dir
+
+logger = logging.getLogger("projspec")
+
+# info keys which change when a file's content does, for the various backends
+_version_keys = ("size", "mtime", "LastModified", "ETag", "etag", "created")
+
+
+def _hash(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, default=str).encode()).hexdigest()
+
+
+class ScanCache:
+    """Resolved specs of directories, stored as one JSON file per directory."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or f"{conf_dir()}/scan_cache"
+
+    @staticmethod
+    def key(url: str, types=None, xtypes=None) -> str:
+        """Identity of a directory scanned with the given type selection"""
+        from projspec import __version__
+        from projspec.proj.base import registry
+
+        # a new version or plugin set may parse differently
+        return _hash(
+            [
+                url,
+                sorted(types or ()),
+                sorted(xtypes or ()),
+                __version__,
+                sorted(registry),
+            ]
+        )
+
+    @staticmethod
+    def fingerprint(listing: list[dict]) -> str:
+        """Summary of a directory listing, changing when any entry changes"""
+        return _hash(
+            sorted(
+                [info["name"]] + [info.get(k) for k in _version_keys]
+                for info in listing
+            )
+        )
+
+    def _fn(self, key: str) -> str:
+        return f"{self.path}/{key[:2]}/{key}.json"
+
+    def get(self, key: str, fingerprint: str) -> dict | None:
+        """The stored data for this key, if its fingerprint matches"""
+        try:
+            with open(self._fn(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("fingerprint") != fingerprint:
+            return None
+        return entry["data"]
+
+    def put(self, key: str, fingerprint: str, data: dict) -> None:
+        """Store data for this key, replacing any previous entry"""
+        fn = self._fn(key)
+        try:
+            text = json.dumps({"fingerprint": fingerprint, "data": data})
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            # write-then-rename, so concurrent readers never see a partial file
+            tmp = f"{fn}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, fn)
+        except (OSError, TypeError, ValueError):
+            logger.debug("Failed to store scan cache entry %s", fn, exc_info=True)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        import shutil
+
+        shutil.rmtree(self.path, ignore_errors=True)
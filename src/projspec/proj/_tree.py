@@ -0,0 +1,145 @@
+"""A listing of a whole directory tree, made once per walk.
+
+Without this, every nested :class:`~projspec.proj.base.Project` lists its own
+directory for ``filelist``, and the root's file statistics then walk the very
+same tree again - so remote trees get listed at least twice. A
+:class:`TreeSnapshot` lists each (non-excluded) directory exactly once and is
+shared by the root and all its descendants: child projects slice their
+``filelist`` out of it, and ``file_count``/``total_size``/``last_modified`` for
+any subtree are computed from it without further I/O.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+import fsspec
+
+from projspec.utils import GitIgnore
+
+logger = logging.getLogger("projspec")
+
+
+def _norm(path: str) -> str:
+    return path.rstrip("/") or path
+
+
+class TreeSnapshot:
+    """Detailed listings of every visited directory below a root.
+
+    Directories for which ``prune(path)`` is true are neither listed nor
+    descended into, but still appear as entries in their parent's listing. If a
+    :class:`~projspec.utils.GitIgnore` is given, each directory's .gitignore is
+    loaded into it as the directory is listed, and ignored files are not counted
+    in ``stats``.
+    """
+
+    def __init__(self, fs: fsspec.AbstractFileSystem, root: str):
+        self.fs = fs
+        self.root = _norm(root)
+        # directory path -> list of info dicts, exactly as from ``fs.ls``
+        self.listings: dict[str, list[dict]] = {}
+        self.gitignore: GitIgnore | None = None
+
+    @classmethod
+    def build(
+        cls,
+        fs: fsspec.AbstractFileSystem,
+        root: str,
+        prune: Callable[[str], bool],
+        executor: Executor | None = None,
+        seed: dict[str, list[dict]] | None = None,
+        gitignore: GitIgnore | None = None,
+    ) -> TreeSnapshot:
+        """List the whole tree below ``root``, one level at a time.
+
+        :param prune: called with a directory's full path; if True, skip it.
+        :param executor: if given, list the directories of each level concurrently.
+        :param seed: listings already known (e.g., the root's ``filelist``), which
+            are not fetched again.
+        :param gitignore: rules to add the .gitignore of each listed directory to;
+            ``prune`` is expected to consult it.
+        """
+        from projspec.proj.base import _map_ordered
+
+        snap = cls(fs, root)
+        snap.gitignore = gitignore
+        seed = {_norm(k): v for k, v in (seed or {}).items()}
+
+        def listing(path):
+            if path in seed:
+                return seed[path]
+            try:
+                return fs.ls(path, detail=True)
+            except (FileNotFoundError, NotADirectoryError):
+                return []
+            except Exception:
+                logger.debug("Listing %s failed", path, exc_info=True)
+                return []
+
+        level = [snap.root]
+        while level:
+            nxt = []
+            for path, entries in zip(level, _map_ordered(listing, level, executor)):
+                snap.listings[path] = entries
+                if gitignore is not None and any(
+                    _["name"].endswith("/.gitignore") for _ in entries
+                ):
+                    # rules must be in place before pruning this directory's children
+                    gitignore.load(fs, path)
+                for info in entries:
+                    name = _norm(info["name"])
+                    if (
+                        info.get("type") == "directory"
+                        and name != path
+                        and name not in snap.listings
+                        and not prune(name)
+                    ):
+                        nxt.append(name)
+            level = nxt
+        return snap
+
+    def __contains__(self, path: str) -> bool:
+        return _norm(path) in self.listings
+
+    def ls(self, path: str) -> list[dict]:
+        """The detailed listing of the given directory, as ``fs.ls`` would give."""
+        return self.listings[_norm(path)]
+
+    def stats(self, path: str) -> tuple[int, int, float | None, dict | None]:
+        """Aggregate file statistics for the subtree at ``path``.
+
+        Returns (file_count, total_size, latest mtime, info dict of the most
+        recently modified file).
+        """
+        file_count = 0
+        total_size = 0
+        best_mtime: float | None = None
+        best_info: dict | None = None
+        stack = [_norm(path)]
+        while stack:
+            dirpath = stack.pop()
+            for finfo in self.listings.get(dirpath, ()):
+                if finfo.get("type") == "directory":
+                    name = _norm(finfo["name"])
+                    if name != dirpath and name in self.listings:
+                        stack.append(name)
+                    continue
+                if self.gitignore is not None and self.gitignore.match(finfo["name"]):
+                    continue
+                file_count += 1
+                total_size += finfo.get("size") or 0
+                mtime = finfo.get("mtime") or finfo.get("LastModified")
+                if mtime is not None:
+                    # mtime may be a datetime; normalise to float
+                    ts = (
+                        mtime.timestamp()
+                        if hasattr(mtime, "timestamp")
+                        else float(mtime)
+                    )
+                    if best_mtime is None or ts > best_mtime:
+                        best_mtime = ts
+                        best_info = finfo
+        return file_count, total_size, best_mtime, best_info
@@ -7,6 +7,8 @@ class AIEnabled(ProjectFlag):
     icon = "🤖"
     spec_doc = "https://agents.md/"
 
+    marker_files = {"AGENTS.md", "CLAUDE.md", ".specify"}
+
     def match(self) -> bool:
         return bool(
             {"AGENTS.md", "CLAUDE.md", ".specify"}.intersection(self.proj.basenames)
@@ -29,6 +29,8 @@ class AnacondaProject(ProjectSpec):
         "https://anaconda-project.readthedocs.io/en/latest/user-guide/reference.html"
     )
 
+    marker_files = set(_MANIFESTS)
+
     def match(self) -> bool:
         return any(n in self.proj.basenames for n in _MANIFESTS)
 
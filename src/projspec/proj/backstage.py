@@ -19,6 +19,8 @@ class BackstageCatalog(ProjectSpec):
     icon = "🗺️"
     spec_doc = "https://backstage.io/docs/features/software-catalog/descriptor-format/"
 
+    marker_files = {"catalog-info.yaml"}
+
     def match(self) -> bool:
         return "catalog-info.yaml" in self.proj.basenames
 
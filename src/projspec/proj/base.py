@@ -4,7 +4,8 @@ import logging
 import os
 import stat
 import time
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from itertools import chain
 from functools import cached_property
 
@@ -13,9 +14,12 @@ import fsspec.implementations.local
 import toml
 
 from projspec.config import get_conf
+from projspec.proj._cache import ScanCache
+from projspec.proj._tree import TreeSnapshot
 from projspec.utils import (
     AttrDict,
     DEFAULT,
+    GitIgnore,
     IndentDumper,
     PickleableTomlDecoder,
     camel_to_snake,
@@ -25,6 +29,7 @@ from projspec.utils import (
 
 logger = logging.getLogger("projspec")
 registry = {}
+_index: "_MarkerIndex | None" = None
 
 
 def _fmt_size(n: int) -> str:
@@ -66,6 +71,72 @@ def _humanize_age(ts: float) -> str:
     return f"{days // 365} year{'s' if days >= 730 else ''} ago"
 
 
+def _map_ordered(func: Callable, items: list, executor: Executor | None = None) -> list:
+    """Apply ``func`` to each of ``items``, returning results in input order.
+
+    With an executor, the calls are submitted concurrently. Any call that has
+    not started by the time its result is needed is run in the calling thread
+    instead, so that nested use of the same (bounded) executor cannot deadlock.
+    """
+    if executor is None or len(items) < 2:
+        return [func(_) for _ in items]
+    futures = [executor.submit(func, _) for _ in items]
+    out = []
+    try:
+        for item, fut in zip(items, futures):
+            out.append(func(item) if fut.cancel() else fut.result())
+    finally:
+        for fut in futures:
+            fut.cancel()
+    return out
+
+
+class _MarkerIndex:
+    """Maps marker basenames and suffixes to the specs that declare them
+
+    Built from the ``marker_files``/``marker_suffixes`` of the registered specs,
+    so that a directory only instantiates the specs which could possibly match
+    its contents, plus those without markers, which are always tried.
+    """
+
+    def __init__(self, reg: dict):
+        self.size = len(reg)
+        self.order = sorted(reg)
+        self.always: set[str] = set()
+        self.by_name: dict[str, set[str]] = {}
+        self.by_suffix: dict[str, set[str]] = {}
+        for name, cls in reg.items():
+            # markers describe a particular match(), so take them from the class
+            # defining the match() in use, not from further up the hierarchy
+            owner = next(k for k in cls.__mro__ if "match" in vars(k))
+            files = vars(owner).get("marker_files", ())
+            suffixes = vars(owner).get("marker_suffixes", ())
+            if not files and not suffixes:
+                self.always.add(name)
+            for fn in files:
+                self.by_name.setdefault(fn, set()).add(name)
+            for suff in suffixes:
+                self.by_suffix.setdefault(suff, set()).add(name)
+
+    def candidates(self, basenames: Iterable[str]) -> list[str]:
+        """Names of the specs worth trying for a directory, in registry order"""
+        found = set(self.always)
+        for fn in basenames:
+            found.update(self.by_name.get(fn, ()))
+            for suff, names in self.by_suffix.items():
+                if fn.endswith(suff):
+                    found.update(names)
+        return [_ for _ in self.order if _ in found]
+
+
+def _marker_index() -> _MarkerIndex:
+    """The current marker index, rebuilt whenever more specs are registered"""
+    global _index
+    if _index is None or _index.size != len(registry):
+        _index = _MarkerIndex(registry)
+    return _index
+
+
 class ParseFailed(ValueError):
     """Exception raised when parsing fails: a directory does not meet the given spec."""
 
@@ -82,11 +153,16 @@ class Project:
         path: str,
         storage_options: dict | None = None,
         fs: fsspec.AbstractFileSystem | None = None,
-        # TODO: allow int for walk, for set number of levels; combine with preloading files
-        walk: bool | None = None,
+        # TODO: combine walking with preloading files
+        walk: bool | int | None = None,
         types: set[str] | None = None,
         xtypes: set[str] | None = None,
         excludes: set[str] | None = None,
+        executor: Executor | None = None,
+        tree: TreeSnapshot | None = None,
+        stop_at_terminal: bool = False,
+        gitignore: bool | GitIgnore | None = None,
+        scan_cache: bool | None = None,
     ):
         """
 
@@ -95,10 +171,26 @@ class Project:
         :param fs: if given, use this fsspec-compatible filesystem
         :param walk: if True, unconditionally descend into child directories and attempt
             to parse them. If False, never descend. If None (default), descend only in
-            the case that the root did not many any project type.
+            the case that the root did not many any project type. If an integer,
+            descend at most this many levels below the root.
         :param types: only allow specs whose names are included.
         :param xtypes: disallow specs whose names are in this set
         :param excludes: directory names to ignore. If None, uses `excludes` config value
+        :param executor: thread-based executor on which to resolve sibling child
+            directories concurrently while walking. If None, one is created for the
+            duration of the walk when the ``scan_workers`` config value is above 1.
+        :param tree: listing of the directory tree this project belongs to, shared
+            with the parent project while walking, so that it is only listed once.
+        :param stop_at_terminal: if True, do not descend below any directory matching
+            a spec marked as ``terminal`` (e.g., a python library), whose
+            subdirectories are only parts of that project.
+        :param gitignore: if True, also skip directories and files ignored by git,
+            according to the .gitignore files of the enclosing repository and of
+            the tree itself. May be a GitIgnore instance, which is shared with
+            child projects. If None, uses the ``respect_gitignore`` config value.
+        :param scan_cache: if True, reuse the specs stored on disk for any directory
+            whose listing has not changed since it was last scanned, and store them
+            for those that have. If None, uses the ``scan_cache`` config value.
         """
         if fs is None:
             fs, path = fsspec.url_to_fs(path, **(storage_options or {}))
@@ -115,10 +207,18 @@ class Project:
         self.children = AttrDict()
         self.contents = AttrDict()
         self.artifacts = AttrDict()
-        # read and respect .gitignore? for exclude directories?
         self.excludes = excludes if excludes is not None else set(get_conf("excludes"))
+        if gitignore is None:
+            gitignore = get_conf("respect_gitignore")
+        if gitignore is True:
+            # compiled once here; children inherit the same instance
+            gitignore = GitIgnore.for_path(fs, path)
+        self.gitignore = gitignore or None
+        self.scan_cache = get_conf("scan_cache") if scan_cache is None else scan_cache
         self._reset()
-        self.resolve(walk=walk, types=types, xtypes=xtypes)
+        self.tree = tree
+        self.stop_at_terminal = stop_at_terminal
+        self.resolve(walk=walk, types=types, xtypes=xtypes, executor=executor)
 
     def _reset(self):
         """Prepare this project for parsing with new specs"""
@@ -128,6 +228,7 @@ class Project:
         self.__dict__.pop("pyproject", None)
         self.__dict__.pop("_tree_stats", None)
         self.__dict__.pop("vcs_info", None)
+        self.tree = None
         self._scanned_files = None
         # clear cached files
         self._scanned_files = None
@@ -152,9 +253,38 @@ class Project:
                 pass
         return self.url or self.path
 
+    def _is_excluded(self, path: str) -> bool:
+        """Whether the directory at this path is skipped when walking"""
+        basename = path.rstrip("/").rsplit("/", 1)[-1]
+        if basename in self.excludes or basename.startswith((".", "_")):
+            return True
+        return self.gitignore is not None and self.gitignore.match(path, is_dir=True)
+
+    def _ensure_tree(self, executor: Executor | None = None) -> TreeSnapshot:
+        """The listing of the whole tree below this project, made if necessary"""
+        if self.tree is None or self.url not in self.tree:
+            # don't list this directory again if we already have
+            seed = (
+                {self.url: self.__dict__["filelist"]}
+                if "filelist" in self.__dict__
+                else None
+            )
+            self.tree = TreeSnapshot.build(
+                self.fs,
+                self.url,
+                self._is_excluded,
+                executor=executor,
+                seed=seed,
+                gitignore=self.gitignore,
+            )
+        return self.tree
+
     @cached_property
     def _tree_stats(self) -> dict:
-        """Walk the directory tree and collect aggregate statistics.
+        """Collect aggregate statistics of the directory tree.
+
+        Computed from the (shared) tree listing, so walking a project does not
+        list its directories a second time.
 
         Returns a dict with keys:
           file_count      int   – number of files found (directories excluded)
@@ -169,61 +299,10 @@ class Project:
         total_size = 0
         best_mtime: float | None = None
         best_info: dict | None = None
-
-        def _excluded(name: str) -> bool:
-            return name in self.excludes or name.startswith((".", "_"))
-
         try:
-            for dirpath, subdirs, files in self.fs.walk(
-                self.url, topdown=True, detail=True
-            ):
-                # Prune excluded directories in-place so walk() does not recurse
-                # into them (topdown=True makes in-place mutation effective).
-                # ``subdirs`` is a dict when the backend honours detail=True, but
-                # some backends ignore the flag and yield a plain list of names;
-                # handle both.
-                if isinstance(subdirs, dict):
-                    for name in [n for n in list(subdirs) if _excluded(n)]:
-                        del subdirs[name]
-                elif isinstance(subdirs, list):
-                    subdirs[:] = [n for n in subdirs if not _excluded(n)]
-
-                # ``files`` is a {name: info} dict when detail is honoured, or a
-                # list of names otherwise. Normalise to an iterable of
-                # (name, info-or-None) so file counting works for both - the
-                # previous code silently counted zero files for list-yielding
-                # backends (a common cause of "remote project shows 0 files").
-                if isinstance(files, dict):
-                    file_items = list(files.items())
-                elif isinstance(files, list):
-                    file_items = [(name, None) for name in files]
-                else:
-                    file_items = []
-
-                for name, finfo in file_items:
-                    # Resolve a detail dict: provided directly, or fetched
-                    # lazily via info() when the backend only gave us a name.
-                    if not isinstance(finfo, dict):
-                        full = f"{dirpath.rstrip('/')}/{name}" if name else dirpath
-                        try:
-                            finfo = self.fs.info(full)
-                        except Exception:
-                            finfo = {}
-                    if finfo.get("type") == "directory":
-                        continue
-                    file_count += 1
-                    total_size += finfo.get("size") or 0
-                    mtime = finfo.get("mtime") or finfo.get("LastModified")
-                    if mtime is not None:
-                        # mtime may be a datetime; normalise to float
-                        ts = (
-                            mtime.timestamp()
-                            if hasattr(mtime, "timestamp")
-                            else float(mtime)
-                        )
-                        if best_mtime is None or ts > best_mtime:
-                            best_mtime = ts
-                            best_info = finfo
+            file_count, total_size, best_mtime, best_info = self._ensure_tree().stats(
+                self.url
+            )
         except Exception:
             logger.debug("_tree_stats walk failed for %s", self.url, exc_info=True)
 
@@ -365,17 +444,22 @@ class Project:
 
     def resolve(
         self,
-        walk: bool | None = None,
+        walk: bool | int | None = None,
         types: set[str] | None = None,
         xtypes: set[str] | None = None,
+        executor: Executor | None = None,
     ) -> None:
         """Fill out project specs in this directory
 
         :param walk: if None (default) only try subdirectories if root has
             no specs, and don't descend further. If True, recurse all directories;
-            if False, don't descend at all.
+            if False (or 0), don't descend at all; if a positive integer, recurse
+            at most that many levels.
         :param types: names of types to allow while parsing. If empty or None, allow all
         :param xtypes: names of types to disallow while parsing.
+        :param executor: if given, resolve sibling child directories concurrently on
+            this (thread-based) executor. If None, one is created for the walk when
+            the ``scan_workers`` config value is above 1.
         """
         types = set(camel_to_snake(_) for _ in types or ())
         if types and types - set(registry):
@@ -387,14 +471,60 @@ class Project:
                 f"Cannot scan {self.path!r}: the required fsspec backend is not "
                 "installed in this environment. Install it and try again."
             )
+        workers = get_conf("scan_workers")
+        if executor is None and (walk or walk is None) and workers > 1:
+            # one pool for the whole walk, shared by all descendants
+            with ThreadPoolExecutor(workers) as pool:
+                return self.resolve(walk, types, xtypes, executor=pool)
         # record when this (re)scan happened
         self.scanned_at = time.time()
+        if walk:
+            # list the whole tree up front; this directory and all children are
+            # then served from the one listing
+            self._ensure_tree(executor)
+        if self.scan_cache:
+            self._resolve_cached(types, xtypes)
+        else:
+            self._resolve_specs(types, xtypes)
+        if self.stop_at_terminal and any(
+            getattr(_, "terminal", False) for _ in self.specs.values()
+        ):
+            # subdirectories belong to this project, not independent ones
+            return
+        if walk or (walk is None and not self.specs):
+            self._ensure_tree(executor)
+            subdirs = []
+            for fileinfo in self.filelist:
+                if fileinfo["type"] == "directory":
+                    basename = fileinfo["name"].rsplit("/", 1)[-1]
+                    if self._is_excluded(fileinfo["name"]):
+                        continue
+                    subdirs.append((basename, fileinfo["name"]))
+            projs = self._resolve_children(subdirs, walk, types, xtypes, executor)
+            for (basename, _), proj2 in zip(subdirs, projs):
+                if proj2.specs:
+                    self.children[basename] = proj2
+                elif proj2.children:
+                    self.children.update(
+                        {
+                            f"{basename.rstrip('/')}/{s2.lstrip('/')}": p
+                            for s2, p in proj2.children.items()
+                        }
+                    )
+
+    def _resolve_specs(self, types: set[str], xtypes: set[str] | None) -> None:
+        """Parse the specs of this directory only"""
+        index = _marker_index()
+        try:
+            candidates = index.candidates(self.basenames)
+        except Exception:
+            # listing failed; let each spec fail (and log) individually
+            candidates = index.order
         # sorting to ensure consistency
-        for name in sorted(registry):
-            cls = registry[name]
+        for snake_name in candidates:
+            cls = registry[snake_name]
             try:
                 name = cls.__name__
-                snake_name = camel_to_snake(cls.__name__)
                 if (types and {name, snake_name}.isdisjoint(types)) or {
                     name,
                     snake_name,
@@ -413,37 +543,81 @@ class Project:
             except Exception as e:
                 # we don't want to fail the parse completely
                 logger.exception("Failed to resolve spec %r", e)
-        if walk or (walk is None and not self.specs):
-            for fileinfo in self.filelist:
-                if fileinfo["type"] == "directory":
-                    # TODO: some types (like python packages) are recursive; so we should
-                    #  separate out the parse and children steps, and only descend to
-                    #  children if no recursive types match
-                    # Alternatively: allow walk to be an integer, indicating the depth
-                    #  of search.
-                    basename = fileinfo["name"].rsplit("/", 1)[-1]
-                    if basename in self.excludes or basename.startswith((".", "_")):
-                        continue
-                    proj2 = Project(
-                        fileinfo["name"],
-                        fs=self.fs,
-                        walk=walk or False,
-                        types=types,
-                        xtypes=xtypes,
-                        excludes=self.excludes,
-                    )
-                    if proj2.specs:
-                        self.children[basename] = proj2
-                    elif proj2.children:
-                        self.children.update(
-                            {
-                                f"{basename.rstrip('/')}/{s2.lstrip('/')}": p
-                                for s2, p in proj2.children.items()
-                            }
-                        )
+
+    def _resolve_cached(self, types: set[str], xtypes: set[str] | None) -> None:
+        """As _resolve_specs, but reuse the stored result if the listing is unchanged"""
+        from projspec.utils import from_dict
+
+        cache = ScanCache()
+        try:
+            key = cache.key(self.display_url, types, xtypes)
+            fingerprint = cache.fingerprint(self.filelist)
+        except Exception:
+            logger.debug("Cannot fingerprint %s", self.url, exc_info=True)
+            self._resolve_specs(types, xtypes)
+            return
+        data = cache.get(key, fingerprint)
+        if data is not None:
+            try:
+                self.specs = from_dict(data["specs"], self)
+                self.contents = from_dict(data["contents"], self)
+                self.artifacts = from_dict(data["artifacts"], self)
+                return
+            except Exception:
+                # e.g., a spec class that no longer exists; parse afresh
+                logger.debug("Bad scan cache entry for %s", self.url, exc_info=True)
+                self.specs = AttrDict()
+                self.contents = AttrDict()
+                self.artifacts = AttrDict()
+        self._resolve_specs(types, xtypes)
+        data = AttrDict(
+            specs=self.specs, contents=self.contents, artifacts=self.artifacts
+        )
+        try:
+            data = data.to_dict(compact=False)
+        except Exception:
+            logger.debug("Cannot serialise specs of %s", self.url, exc_info=True)
+            return
+        cache.put(key, fingerprint, data)
+
+    def _resolve_children(
+        self,
+        subdirs: list[tuple[str, str]],
+        walk: bool | int | None,
+        types: set[str],
+        xtypes: set[str] | None,
+        executor: Executor | None,
+    ) -> list["Project"]:
+        """Make a Project for each of the (basename, path) pairs, in order."""
+        if walk is True:
+            child_walk = True
+        elif walk:
+            # one level fewer remaining; at zero, children don't descend
+            child_walk = walk - 1 or False
+        else:
+            child_walk = False
+
+        def child(item):
+            return Project(
+                item[1],
+                fs=self.fs,
+                walk=child_walk,
+                types=types,
+                xtypes=xtypes,
+                excludes=self.excludes,
+                executor=executor,
+                tree=self.tree,
+                stop_at_terminal=self.stop_at_terminal,
+                gitignore=self.gitignore or False,
+                scan_cache=self.scan_cache,
+            )
+
+        return _map_ordered(child, subdirs, executor)
 
     @cached_property
     def filelist(self):
+        if self.tree is not None and self.url in self.tree:
+            return self.tree.ls(self.url)
         return self.fs.ls(self.url, detail=True)
 
     @cached_property
@@ -550,8 +724,8 @@ class Project:
         for spec in self.specs.values():
             arts.extend(flatten(spec.artifacts))
         for child in self.children.values():
-            arts.extend(child.artifacts)
-        arts.extend(self.artifacts.values())
+            arts.extend(child.all_artifacts())
+        arts.extend(flatten(self.artifacts))
         if names:
             if isinstance(names, str):
                 names = {names}
@@ -575,12 +749,11 @@ class Project:
     def all_contents(self, names=None) -> list:
         """A flat list of all the content objects nested in this project."""
         # TODO: deduplicate these non-hashables
-        cont = list(self.contents.values())
+        cont = flatten(self.contents)
         for spec in self.specs.values():
             cont.extend(flatten(spec.contents))
         for child in self.children.values():
             cont.extend(child.all_contents(names=names))
-        cont.extend(self.contents.values())
         if names:
             if isinstance(names, str):
                 names = {names}
@@ -656,6 +829,10 @@ class Project:
         proj.artifacts = from_dict(dic["artifacts"], proj)
         proj.path = dic["url"]
         proj.storage_options = dic["storage_options"]
+        proj.tree = None
+        proj.stop_at_terminal = False
+        proj.gitignore = None
+        proj.scan_cache = False
         try:
             proj.fs, proj.url = fsspec.url_to_fs(proj.path, **proj.storage_options)
         except Exception:
@@ -729,15 +906,21 @@ class Project:
         art.make(**kwargs)
         return art
 
-    def add_to_library(self, path=DEFAULT):
-        """Add this project to the current session library"""
+    def add_to_library(self, path=DEFAULT, library=None):
+        """Add this project to the current session library
+
+        :param path: location of the library to load, if ``library`` is not given
+        :param library: an already loaded ProjectLibrary to add to; use its
+            ``transaction()`` to add many projects with a single write.
+        """
         # TODO: prevent overwrite?
         from projspec.library import ProjectLibrary
         import json
 
         # precheck serialisability (prevents malformed JSON diring save)
         json.dumps(self.to_dict(compact=False))
-        library = ProjectLibrary(path)
+        if library is None:
+            library = ProjectLibrary(path)
         library.add_entry(self.fs.unstrip_protocol(self.url), self)
 
     def __bool__(self):
@@ -760,14 +943,27 @@ class ProjectSpec:
     parsing (with .parse()) should normally only require reading a few text files of metadata.
 
     Subclasses are automatically added to the registry on import, and any Project will
-    attempt to parse its given path with every class (which is why making .match() fast
-    is important).
+    attempt to parse its given path with every class whose ``marker_files`` or
+    ``marker_suffixes`` are present, or which declares none (which is why making
+    .match() fast is important).
     """
 
     icon = "📁"  # default; concrete subclasses should override
 
     spec_doc = ""  # URL to prose about this spec
 
+    # Basenames and filename suffixes, at least one of which must be present in a
+    # directory for .match() to possibly succeed. Directories with none of them
+    # skip this spec without instantiating it. If both are empty, the spec is
+    # always tried. Subclasses overriding .match() must declare their own.
+    marker_files: set[str] = set()
+    marker_suffixes: tuple[str, ...] = ()
+
+    # Whether subdirectories of a matching directory are normally parts of this
+    # same project rather than projects in their own right (e.g., the subpackages
+    # of a python library). Walking can stop at such directories.
+    terminal = False
+
     def __init__(self, proj: Project):
         self.proj = proj
         self._contents = AttrDict()
@@ -37,6 +37,8 @@ class Briefcase(ProjectSpec):
     icon = "💼"
     spec_doc = "https://briefcase.readthedocs.io/en/stable/reference/configuration.html"
 
+    marker_files = {"pyproject.toml"}
+
     def match(self) -> bool:
         return "briefcase" in self.proj.pyproject.get("tool", {})
 
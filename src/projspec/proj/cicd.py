@@ -18,6 +18,8 @@ class GitHubActions(ProjectExtra):
     icon = "🐙"
     spec_doc = "https://docs.github.com/en/actions/writing-workflows/workflow-syntax-for-github-actions"
 
+    marker_files = {".github"}
+
     def match(self) -> bool:
         # Check for the .github/workflows directory
         workflows_dir = f"{self.proj.url}/.github/workflows"
@@ -108,6 +110,8 @@ class GitLabCI(ProjectExtra):
     icon = "🦊"
     spec_doc = "https://docs.gitlab.com/ci/yaml/"
 
+    marker_files = {".gitlab-ci.yml"}
+
     def match(self) -> bool:
         return ".gitlab-ci.yml" in self.proj.basenames
 
@@ -171,6 +175,8 @@ class CircleCI(ProjectExtra):
     icon = "⦿"
     spec_doc = "https://circleci.com/docs/configuration-reference/"
 
+    marker_files = {".circleci"}
+
     def match(self) -> bool:
         config_path = f"{self.proj.url}/.circleci/config.yml"
         try:
@@ -238,6 +244,8 @@ class Taskfile(ProjectSpec):
 
     _NAMES = {"Taskfile.yml", "Taskfile.yaml", "taskfile.yml", "taskfile.yaml"}
 
+    marker_files = _NAMES
+
     def match(self) -> bool:
         return bool(self._NAMES.intersection(self.proj.basenames))
 
@@ -299,6 +307,8 @@ class JustFile(ProjectSpec):
 
     _NAMES = {"justfile", "Justfile", ".justfile"}
 
+    marker_files = _NAMES
+
     def match(self) -> bool:
         return bool(self._NAMES.intersection(self.proj.basenames))
 
@@ -353,6 +363,8 @@ class Tox(ProjectSpec):
     icon = "🧪"
     spec_doc = "https://tox.wiki/en/stable/config.html"
 
+    marker_files = {"tox.ini", "tox.toml", "pyproject.toml"}
+
     def match(self) -> bool:
         if "tox.ini" in self.proj.basenames or "tox.toml" in self.proj.basenames:
             return True
@@ -442,6 +454,8 @@ class Makefile(ProjectExtra):
 
     spec_doc = "https://www.gnu.org/software/make/manual/make.html#Makefiles"
 
+    marker_files = {"Makefile"}
+
     def match(self) -> bool:
         return "Makefile" in self.proj.basenames
 
@@ -11,6 +11,8 @@ class CondaRecipe(ProjectSpec):
         "en/stable/resources/define-metadata.html"
     )
 
+    marker_files = {"meta.yaml", "meta.yml", "conda.yaml"}
+
     def match(self) -> bool:
         return not {"meta.yaml", "meta.yml", "conda.yaml"}.isdisjoint(
             self.proj.basenames
@@ -71,6 +73,8 @@ class RattlerRecipe(CondaRecipe):
 
     # conda recipes are also valid for rattler if they don't have complex jinja.
 
+    marker_files = {"recipe.yaml"}
+
     def match(self) -> bool:
         return "recipe.yaml" in self.proj.basenames
 
@@ -32,6 +32,8 @@ class CondaProject(ProjectSpec):
                 "commands: {}\n"
             )
 
+    marker_files = {"conda-project.yml", "conda-meta.yaml"}
+
     def match(self) -> bool:
         # TODO: a .condarc or environment.yml file is actually enough, e.g.,
         #  https://github.com/conda-incubator/conda-project/tree/main/examples/condarc-settings
@@ -40,6 +40,8 @@ class CondaWorkspace(ProjectSpec):
                 pass
         return meta
 
+    marker_files = {"pyproject.toml", "conda.toml"}
+
     def match(self) -> bool:
         # A bare conda.toml without [workspace] is permitted by the spec
         # as a tasks-only manifest; it does not constitute a workspace
@@ -12,6 +12,8 @@ class DataPackage(ProjectSpec):
     # only tabular data; docs suggest csv, xls, json filetypes; JSON
     # can be inline in the metadata. sqlite and yaml are also mentioned.
 
+    marker_files = {"datapackage.json"}
+
     def match(self) -> bool:
         return "datapackage.json" in self.proj.basenames
 
@@ -76,6 +78,8 @@ class DVCRepo(ProjectSpec):
     icon = "🌿"
     spec_doc = "https://doc.dvc.org/command-reference/config"
 
+    marker_files = {".dvc"}
+
     def match(self) -> bool:
         return ".dvc" in self.proj.basenames
 
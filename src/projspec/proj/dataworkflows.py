@@ -21,6 +21,8 @@ class Dbt(ProjectSpec):
     icon = "🗂️"
     spec_doc = "https://docs.getdbt.com/reference/dbt_project.yml"
 
+    marker_files = {"dbt_project.yml"}
+
     def match(self) -> bool:
         return "dbt_project.yml" in self.proj.basenames
 
@@ -104,6 +106,9 @@ class Quarto(ProjectSpec):
     icon = "📜"
     spec_doc = "https://quarto.org/docs/reference/projects/core.html"
 
+    marker_files = {"_quarto.yml", "_quarto.yaml"}
+    marker_suffixes = (".qmd",)
+
     def match(self) -> bool:
         if (
             "_quarto.yml" in self.proj.basenames
@@ -195,6 +200,8 @@ class Prefect(ProjectSpec):
     icon = "💧"
     spec_doc = "https://docs.prefect.io/v3/deploy/infrastructure-concepts/prefect-yaml"
 
+    marker_files = {"prefect.yaml"}
+
     def match(self) -> bool:
         return "prefect.yaml" in self.proj.basenames
 
@@ -260,6 +267,8 @@ class Dagster(ProjectSpec):
     icon = "🗺️"
     spec_doc = "https://docs.dagster.io/api/python-api/workspace"
 
+    marker_files = {"pyproject.toml", "dagster.yaml", "workspace.yaml"}
+
     def match(self) -> bool:
         if self.proj.pyproject.get("tool", {}).get("dagster"):
             return True
@@ -311,6 +320,8 @@ class Kedro(ProjectSpec):
     icon = "🕸️"
     spec_doc = "https://docs.kedro.org/en/stable/kedro_project_setup/settings.html"
 
+    marker_files = {"pyproject.toml"}
+
     def match(self) -> bool:
         return bool(self.proj.pyproject.get("tool", {}).get("kedro"))
 
@@ -379,6 +390,8 @@ class Airflow(ProjectSpec):
         "https://airflow.apache.org/docs/apache-airflow/stable/core-concepts/dags.html"
     )
 
+    marker_files = {"dags"}
+
     def match(self) -> bool:
         dags_dir = f"{self.proj.url}/dags"
         try:
@@ -453,6 +466,8 @@ class Snakemake(ProjectSpec):
         "https://snakemake.readthedocs.io/en/stable/snakefiles/configuration.html"
     )
 
+    marker_files = {"Snakefile", "workflow"}
+
     def match(self) -> bool:
         if "Snakefile" in self.proj.basenames:
             return True
@@ -517,6 +532,8 @@ class Nox(ProjectSpec):
     icon = "🧪"
     spec_doc = "https://nox.thea.codes/en/stable/config.html"
 
+    marker_files = {"noxfile.py"}
+
     def match(self) -> bool:
         return "noxfile.py" in self.proj.basenames
 
@@ -603,6 +620,8 @@ class Metaflow(ProjectSpec):
     _STEP_RE = re.compile(r"@step\s+def\s+(\w+)\s*\(")
     _DEPLOY_RE = re.compile(r"@schedule|@trigger|@trigger_on_finish|@project")
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         for path, content in self.proj.scanned_files.items():
             if not path.endswith(".py"):
@@ -735,6 +754,8 @@ class MLFlow(ProjectSpec):
         "https://mlflow.org/docs/latest/ml/projects/#mlproject-file-configuration"
     )
 
+    marker_files = {"MLproject", "MLFlow"}
+
     def match(self) -> bool:
         return "MLproject" in self.proj.basenames or "MLFlow" in self.proj.basenames
 
@@ -22,6 +22,8 @@ class MDBook(ProjectSpec):
 
     spec_doc = "https://rust-lang.github.io/mdBook/format/configuration/index.html"
 
+    marker_files = {"book.toml"}
+
     def match(self) -> bool:
         return "book.toml" in self.proj.basenames
 
@@ -261,6 +263,8 @@ class MkDocs(ProjectSpec):
 
     _NAMES = {"mkdocs.yml", "mkdocs.yaml"}
 
+    marker_files = _NAMES
+
     def match(self) -> bool:
         return bool(self._NAMES.intersection(self.proj.basenames))
 
@@ -331,6 +335,8 @@ class Sphinx(ProjectSpec):
     icon = "📜"
     spec_doc = "https://www.sphinx-doc.org/en/master/usage/configuration.html"
 
+    marker_files = {"conf.py", "docs"}
+
     def match(self) -> bool:
         if "conf.py" in self.proj.basenames:
             return True
@@ -418,6 +424,8 @@ class Docusaurus(ProjectSpec):
         "docusaurus.config.mjs",
     }
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
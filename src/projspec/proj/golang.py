@@ -11,6 +11,9 @@ class Golang(ProjectSpec):
     icon = "🐹"
     spec_doc = "https://go.dev/doc/modules/gomod-ref"
 
+    marker_files = {"go.mod"}
+    terminal = True
+
     def match(self) -> bool:
         return "go.mod" in self.proj.basenames
 
@@ -20,6 +20,8 @@ class HelmChart(ProjectSpec):
     icon = "☸️"
     spec_doc = "https://helm.sh/docs/topics/charts/#the-chartyaml-file"
 
+    marker_files = {"Chart.yaml"}
+
     def match(self) -> bool:
         return "Chart.yaml" in self.proj.basenames
 
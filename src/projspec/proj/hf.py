@@ -29,6 +29,8 @@ class HuggingFaceRepo(ProjectSpec):
     #  license, license_name, license_link, model-index (results)
     # Dataset names are the same as the repo names in HF.
 
+    marker_files = {"README.md"}
+
     def match(self) -> bool:
         return "README.md" in self.proj.basenames
 
@@ -132,6 +134,8 @@ class HuggingFaceDataset(ProjectSpec):
     # detailed spec: https://raw.githubusercontent.com/huggingface/hub-docs/refs/heads/main/datasetcard.md
     spec_doc = "https://huggingface.co/docs/hub/datasets-cards"
 
+    marker_files = {"README.md"}
+
     def match(self) -> bool:
         return "README.md" in self.proj.basenames
 
@@ -10,6 +10,8 @@ class NvidiaAIWorkbench(ProjectSpec):
         "https://docs.nvidia.com/ai-workbench/user-guide/latest/projects/spec.html"
     )
 
+    marker_files = {".project"}
+
     def match(self) -> bool:
         return self.proj.fs.exists(f"{self.proj.url}/.project/spec.yaml")
 
@@ -29,6 +31,8 @@ class NvidiaAIWorkbench(ProjectSpec):
 class JetbrainsIDE(ProjectFlag):
     icon = "🛩️"
 
+    marker_files = {".idea"}
+
     def match(self) -> bool:
         return self.proj.fs.exists(f"{self.proj.url}/.idea")
 
@@ -39,6 +43,8 @@ class VSCode(ProjectFlag):
         "https://code.visualstudio.com/docs/configure/settings#_settings-json-file"
     )
 
+    marker_files = {".vscode"}
+
     def match(self) -> bool:
         return self.proj.fs.exists(f"{self.proj.url}/.vscode/settings.json")
 
@@ -47,5 +53,7 @@ class Zed(ProjectFlag):
     icon = "⚡"
     spec_doc = "https://zed.dev/docs/configuring-zed#settings"
 
+    marker_files = {".zed"}
+
     def match(self) -> bool:
         return self.proj.fs.exists(f"{self.proj.url}/.zed/settings.json")
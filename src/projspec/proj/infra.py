@@ -26,6 +26,8 @@ class DockerCompose(ProjectSpec):
         "compose.yaml",
     }
 
+    marker_files = _NAMES
+
     def match(self) -> bool:
         return bool(self._NAMES.intersection(self.proj.basenames))
 
@@ -95,6 +97,8 @@ class Terraform(ProjectSpec):
     icon = "☁️"
     spec_doc = "https://developer.hashicorp.com/terraform/language"
 
+    marker_suffixes = (".tf",)
+
     def match(self) -> bool:
         return any(n.endswith(".tf") for n in self.proj.basenames)
 
@@ -186,6 +190,9 @@ class Ansible(ProjectSpec):
 
     _PLAYBOOK_NAMES = {"playbook.yml", "playbook.yaml", "site.yml", "site.yaml"}
 
+    marker_files = {"ansible.cfg"} | _PLAYBOOK_NAMES
+    marker_suffixes = (".yml", ".yaml")
+
     def match(self) -> bool:
         if "ansible.cfg" in self.proj.basenames:
             return True
@@ -250,6 +257,8 @@ class Pulumi(ProjectSpec):
 
     _NAMES = {"Pulumi.yaml", "Pulumi.yml"}
 
+    marker_files = _NAMES
+
     def match(self) -> bool:
         return bool(self._NAMES.intersection(self.proj.basenames))
 
@@ -322,6 +331,8 @@ class CDK(ProjectSpec):
     icon = "☁️"
     spec_doc = "https://docs.aws.amazon.com/cdk/v2/guide/projects.html"
 
+    marker_files = {"cdk.json"}
+
     def match(self) -> bool:
         return "cdk.json" in self.proj.basenames
 
@@ -382,6 +393,8 @@ class Earthfile(ProjectSpec):
     icon = "🌎"
     spec_doc = "https://docs.earthly.dev/docs/earthfile"
 
+    marker_files = {"Earthfile"}
+
     def match(self) -> bool:
         return "Earthfile" in self.proj.basenames
 
@@ -441,6 +454,8 @@ class Nixpacks(ProjectSpec):
     icon = "❄️"
     spec_doc = "https://nixpacks.com/docs/configuration/file"
 
+    marker_files = {"nixpacks.toml"}
+
     def match(self) -> bool:
         return "nixpacks.toml" in self.proj.basenames
 
@@ -502,6 +517,8 @@ class Vagrant(ProjectSpec):
     icon = "🗃️"
     spec_doc = "https://developer.hashicorp.com/vagrant/docs/vagrantfile"
 
+    marker_files = {"Vagrantfile"}
+
     def match(self) -> bool:
         return "Vagrantfile" in self.proj.basenames
 
@@ -20,6 +20,8 @@ class NextJS(Node):
         "next.config.cjs",
     }
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
@@ -73,6 +75,8 @@ class NuxtJS(Node):
 
     _CONFIG_NAMES = {"nuxt.config.js", "nuxt.config.ts", "nuxt.config.mjs"}
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
@@ -122,6 +126,8 @@ class SvelteKit(Node):
 
     _CONFIG_NAMES = {"svelte.config.js", "svelte.config.ts"}
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
@@ -182,6 +188,8 @@ class Vite(Node):
         "vite.config.mts",
     }
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
@@ -238,6 +246,8 @@ class Pnpm(Node):
     icon = "📦"
     spec_doc = "https://pnpm.io/package_json"
 
+    marker_files = {"pnpm-lock.yaml"}
+
     def match(self) -> bool:
         return "pnpm-lock.yaml" in self.proj.basenames
 
@@ -284,6 +294,8 @@ class Bun(Node):
     icon = "🍞"
     spec_doc = "https://bun.sh/docs/install/lockfile"
 
+    marker_files = {"bun.lock", "bun.lockb"}
+
     def match(self) -> bool:
         return bool({"bun.lock", "bun.lockb"}.intersection(self.proj.basenames))
 
@@ -315,6 +327,8 @@ class Deno(ProjectSpec):
 
     _CONFIG_NAMES = {"deno.json", "deno.jsonc"}
 
+    marker_files = _CONFIG_NAMES
+
     def match(self) -> bool:
         return bool(self._CONFIG_NAMES.intersection(self.proj.basenames))
 
@@ -65,6 +65,8 @@ class KnowledgeCatalog(ProjectSpec):
         "https://github.com/GoogleCloudPlatform/knowledge-catalog/blob/main/okf/SPEC.md"
     )
 
+    marker_files = {"index.md"}
+
     def match(self) -> bool:
         """Cheap check: a reserved ``index.md`` is present, plus either another
         markdown document or a subdirectory that might hold concepts.
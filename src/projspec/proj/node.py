@@ -17,6 +17,8 @@ class Node(ProjectSpec):
     icon = "🟩"
     spec_doc = "https://docs.npmjs.com/cli/v11/configuring-npm/package-json"
 
+    marker_files = {"package.json"}
+
     def match(self):
         return "package.json" in self.proj.basenames
 
@@ -132,6 +134,8 @@ class Yarn(Node):
     icon = "🧶"
     spec_doc = "https://yarnpkg.com/configuration/yarnrc"
 
+    marker_files = {".yarnrc.yml"}
+
     def match(self):
         return ".yarnrc.yml" in self.proj.basenames
 
@@ -183,6 +187,8 @@ class JLabExtension(Yarn):
     # TODO: we may add a jupyter server extension python project type in the
     #  future, defined by a JSON server config file.
 
+    marker_files = {"package.json"}
+
     def match(self):
         return "package.json" in self.proj.basenames and bool(self.proj.pyproject)
 
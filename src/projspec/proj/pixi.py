@@ -59,6 +59,8 @@ class Pixi(ProjectSpec):
     # spec docs
     # https://pixi.sh/dev/reference/pixi_manifest/
 
+    marker_files = {"pyproject.toml", "pixi.toml"}
+
     def match(self) -> bool:
         meta = self.proj.pyproject.get("tool", {}).get("pixi", {})
         return bool(meta) or "pixi.toml" in self.proj.basenames
@@ -17,6 +17,8 @@ class Poetry(PythonLibrary):
     icon = "🪶"
     spec_doc = "https://python-poetry.org/docs/pyproject/"
 
+    marker_files = {"pyproject.toml"}
+
     def match(self) -> bool:
         back = (
             self.proj.pyproject.get("build_system", {})
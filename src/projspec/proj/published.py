@@ -9,6 +9,8 @@ class Cited(ProjectExtra):
     icon = "💬"
     spec_doc = "https://citation-file-format.github.io/"
 
+    marker_files = {"CITATION.cff"}
+
     def match(self):
         return "CITATION.cff" in self.proj.basenames
 
@@ -26,6 +28,8 @@ class Zenodo(ProjectExtra):
     icon = "⬆️"
     spec_doc = "https://help.zenodo.org/docs/github/describe-software/zenodo-json/"
 
+    marker_files = {".zenodo.json"}
+
     def match(self):
         # NB: zenodo picks up CITATION.cff too, but this format is more specific
         return ".zenodo.json" in self.proj.basenames
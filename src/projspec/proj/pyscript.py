@@ -16,6 +16,8 @@ class PyScript(ProjectSpec):
     icon = "🌐"
     spec_doc = "https://docs.pyscript.net/2023.11.2/user-guide/configuration/"
 
+    marker_files = {"pyscript.toml", "pyscript.json"}
+
     def match(self) -> bool:
         # actually, config can be specified by a local path in the repo, but this is rare;
         # also you can just declare things to install as you go, which we won't be able to
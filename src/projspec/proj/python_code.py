@@ -24,6 +24,8 @@ class PythonCode(ProjectSpec):
     icon = "🐍"
     spec_doc = "https://docs.python.org/3/reference/import.html#regular-packages"
 
+    marker_files = {"__init__.py"}
+
     def match(self) -> bool:
         return "__init__.py" in self.proj.basenames
 
@@ -60,6 +62,9 @@ class PythonLibrary(ProjectSpec):
     # setup.py never had a spec
     spec_doc = "https://packaging.python.org/en/latest/specifications/pyproject-toml/"
 
+    marker_files = {"pyproject.toml", "setup.py"}
+    terminal = True
+
     def match(self) -> bool:
         return not {"pyproject.toml", "setup.py"}.isdisjoint(self.proj.basenames)
 
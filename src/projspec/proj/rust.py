@@ -9,6 +9,9 @@ class Rust(ProjectSpec):
     icon = "🦀"
     spec_doc = "https://doc.rust-lang.org/cargo/reference/manifest.html"
 
+    marker_files = {"Cargo.toml"}
+    terminal = True
+
     def match(self) -> bool:
         return "Cargo.toml" in self.proj.basenames
 
@@ -53,6 +56,8 @@ class RustPython(Rust, PythonLibrary):
     icon = "⚙️"
     spec_doc = "https://www.maturin.rs/config.html"
 
+    marker_files = {"Cargo.toml"}
+
     def match(self) -> bool:
         # The second condition here is not necessarily required, it is enough to
         # have a python package directory with the same name as the rust library.
@@ -58,6 +58,8 @@ class UvScript(PythonLibrary):
     icon = "📜"
     spec_doc = "https://docs.astral.sh/uv/guides/scripts/"
 
+    marker_suffixes = (".py", ".pyw")
+
     def match(self):
         # this is a file, not a directory
         return any(_.endswith(".py") for _ in self.proj.scanned_files) or (
@@ -155,6 +157,8 @@ class Uv(PythonLibrary):
     icon = "🚀"
     spec_doc = "https://docs.astral.sh/uv/concepts/configuration-files/"
 
+    marker_files = {"uv.lock", "uv.toml", ".python-version", "pyproject.toml", ".venv"}
+
     def match(self):
         if not {"uv.lock", "uv.toml", ".python-version"}.isdisjoint(
             self.proj.basenames
@@ -33,6 +33,8 @@ class GitRepo(ProjectSpec):
     icon = "🔀"
     spec_doc = "https://git-scm.com/docs/git-config#_configuration_file"
 
+    marker_files = {".git"}
+
     def match(self) -> bool:
         return ".git" in self.proj.basenames
 
@@ -105,6 +107,8 @@ class HgRepo(ProjectSpec):
     icon = "🪢"
     spec_doc = "https://www.mercurial-scm.org/wiki/Repository"
 
+    marker_files = {".hg"}
+
     def match(self) -> bool:
         return ".hg" in self.proj.basenames
 
@@ -187,6 +191,8 @@ class FossilRepo(ProjectSpec):
     icon = "🦴"
     spec_doc = "https://fossil-scm.org/home/doc/trunk/www/fileformat.wiki"
 
+    marker_files = set(_CHECKOUT_NAMES)
+
     def match(self) -> bool:
         return any(name in self.proj.basenames for name in _CHECKOUT_NAMES)
 
@@ -14,6 +14,8 @@ class Django(ProjectSpec):
     # this is the metadata settings reference
     spec_doc = "https://docs.djangoproject.com/en/6.0/ref/settings/"
 
+    marker_files = {"manage.py"}
+
     def match(self):
         return "manage.py" in self.proj.basenames
 
@@ -65,6 +67,8 @@ class Streamlit(ProjectSpec):
         "address_arg": "--server.port",
     }
 
+    marker_files = {".streamlit", "streamlit_app.py"}
+
     def match(self) -> bool:
         # more possible layouts
         return bool(
@@ -160,6 +164,8 @@ class Marimo(ProjectSpec):
     spec_doc = "https://docs.marimo.io/"
     server_args = {"port_arg": "--port", "address_arg": "--host"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         return any(fn.endswith(".py") for fn in self.proj.scanned_files)
 
@@ -211,6 +217,8 @@ class Flask(ProjectSpec):
     spec_doc = "https://flask.palletsprojects.com/en/stable/config/"
     server_args = {"port_arg": "--port", "address_arg": "--host"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         # the default and common name for the main file is app.py
         return (
@@ -274,6 +282,8 @@ class FastAPI(ProjectSpec):
     spec_doc = "https://fastapi.tiangolo.com/advanced/settings/"
     server_args = {"port_arg": "--port", "address_arg": "--host"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         # the default and common name for the main file is app.py
         return (
@@ -332,6 +342,8 @@ class Dash(ProjectSpec):
     spec_doc = "https://dash.plotly.com/tutorial"  # no actual configuration
     server_args = {"in_env": True, "port_arg": "PORT", "address_arg": "HOST"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         # the default and common name for the main file is app.py
         return (
@@ -397,6 +409,8 @@ class Panel(ProjectSpec):
     icon = "📊"
     spec_doc = "https://panel.holoviz.org/api/config.html"
 
+    marker_suffixes = (".py", ".ipynb")
+
     def match(self) -> bool:
         # the default and common name for the main file is app.py
         return (
@@ -449,6 +463,8 @@ class Gradio(ProjectSpec):
     spec_doc = "https://www.gradio.app/docs/gradio/interface"
     server_args = {"port_arg": "--server-port", "address_arg": "--server-name"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         return (
             any(fn.endswith(".py") for fn in self.proj.scanned_files)
@@ -512,6 +528,8 @@ class Shiny(ProjectSpec):
     spec_doc = "https://shiny.posit.co/py/docs/overview.html"
     server_args = {"port_arg": "--port", "address_arg": "--host"}
 
+    marker_suffixes = (".py",)
+
     def match(self) -> bool:
         return (
             any(fn.endswith(".py") for fn in self.proj.scanned_files)
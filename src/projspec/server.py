@@ -0,0 +1,337 @@
+"""A long-running projspec process, answering requests as JSON-RPC
+
+Every ``projspec`` CLI invocation pays for starting python, importing all the
+spec modules and reading the library. IDE hosts, which call the CLI for every
+refresh, can instead start ``projspec serve`` once: it keeps the registry,
+config and :class:`~projspec.library.ProjectLibrary` in memory and answers
+newline-delimited JSON-RPC 2.0 requests, either on stdin/stdout
+(``--stdio``) or on a localhost socket.
+
+In socket mode, the address and an access token are written to
+``daemon.json`` in the config directory (readable by the current user only),
+and the ``projspec`` command forwards itself to the running daemon (see
+:func:`client_main`), so existing callers of the CLI need not change.
+
+Methods:
+
+- ``run(args, cwd=None)``: run the CLI with the given arguments, returning
+  ``{"stdout", "stderr", "exit_code"}``, exactly as the command would print
+- ``info()``: as ``projspec info``
+- ``library_list()``: as ``projspec library list --json-out``
+- ``library_delete(url)``: as ``projspec library delete``
+- ``scan(paths, walk=False, library=False, storage_options="")``: the
+  serialised projects found, as ``projspec scan --json-out``
+- ``ping()`` and ``shutdown()``
+"""
+
+from __future__ import annotations
+
+import contextlib
+import inspect
+import io
+import json
+import logging
+import os
+import secrets
+import socketserver
+import sys
+
+from projspec.config import conf_dir
+
+logger = logging.getLogger("projspec")
+
+# commands which may be forwarded to a daemon; others (e.g., "make", which runs
+# processes in the caller's terminal, or "config", which changes the caller's
+# settings) always run locally
+forwarded_commands = {"info", "library", "scan", "version"}
+
+
+def address_file() -> str:
+    return os.path.join(conf_dir(), "daemon.json")
+
+
+class Daemon:
+    """Holds the warm state, and dispatches JSON-RPC requests to methods"""
+
+    def __init__(self):
+        self.library = None
+        self._library_stamp = None
+        self.running = True
+
+    def _refresh(self):
+        """Pick up changes to config or library made by other processes"""
+        from projspec.config import get_conf, load_conf
+        from projspec.library import ProjectLibrary
+
+        load_conf()
+        path = get_conf("library_path")
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if self.library is None or self._library_stamp != (path, mtime):
+            self.library = ProjectLibrary(path)
+        self._library_stamp = (path, mtime)
+
+    def _after(self):
+        # our own writes should not cause a reload next time
+        path = self.library.path
+        try:
+            self._library_stamp = (path, os.path.getmtime(path))
+        except (OSError, TypeError):
+            self._library_stamp = (path, None)
+
+    def handle(self, request: dict) -> dict | None:
+        """Answer one JSON-RPC request; None for notifications"""
+        rid = request.get("id")
+        method = request.get("method")
+        func = getattr(self, f"rpc_{method}", None) if isinstance(method, str) else None
+        if func is None:
+            error = {"code": -32601, "message": f"Method not found: {method}"}
+            return {"jsonrpc": "2.0", "id": rid, "error": error}
+        params = request.get("params") or {}
+        args, kwargs = (params, {}) if isinstance(params, list) else ((), params)
+        try:
+            inspect.signature(func).bind(*args, **kwargs)
+        except TypeError as e:
+            error = {"code": -32602, "message": str(e)}
+            return {"jsonrpc": "2.0", "id": rid, "error": error}
+        try:
+            self._refresh()
+            result = func(*args, **kwargs)
+            self._after()
+        except Exception as e:
+            logger.debug("Request %s failed", method, exc_info=True)
+            error = {"code": -32000, "message": f"{type(e).__name__}: {e}"}
+            return {"jsonrpc": "2.0", "id": rid, "error": error}
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": rid, "result": result}
+
+    def rpc_ping(self) -> str:
+        return "pong"
+
+    def rpc_shutdown(self) -> None:
+        self.running = False
+
+    def rpc_run(self, args: list[str], cwd: str | None = None) -> dict:
+        import click
+
+        from projspec.__main__ import context, main
+
+        out, err = io.StringIO(), io.StringIO()
+        code = 0
+        old_cwd = os.getcwd()
+        context["library"] = self.library
+        try:
+            if cwd:
+                os.chdir(cwd)
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    main(list(args), prog_name="projspec", standalone_mode=False)
+                except click.ClickException as e:
+                    e.show(file=err)
+                    code = e.exit_code
+                except click.exceptions.Exit as e:
+                    code = e.exit_code
+                except click.Abort:
+                    code = 1
+                except SystemExit as e:
+                    code = e.code if isinstance(e.code, int) else int(e.code is not None)
+                except Exception as e:
+                    err.write(f"Error: {type(e).__name__}: {e}\n")
+                    code = 1
+        finally:
+            context.pop("library", None)
+            os.chdir(old_cwd)
+        return {"stdout": out.getvalue(), "stderr": err.getvalue(), "exit_code": code}
+
+    def rpc_info(self) -> dict:
+        from projspec.utils import class_infos
+
+        return class_infos()
+
+    def rpc_library_list(self) -> dict:
+        entries = self.library.entries
+        return {k: entries.raw(k) for k in entries}
+
+    def rpc_library_delete(self, url: str) -> None:
+        self.library.delete(url)
+
+    def rpc_scan(
+        self,
+        paths: list[str],
+        walk: bool | int = False,
+        library: bool = False,
+        storage_options: str | dict = "",
+    ) -> list[dict]:
+        from projspec.utils import scan_glob
+
+        return [
+            proj.to_dict(compact=False)
+            for path in paths
+            for proj in scan_glob(
+                path,
+                walk=walk,
+                storage_options=storage_options,
+                add_to_library=self.library if library else False,
+            )
+        ]
+
+
+def _respond(daemon: Daemon, line: bytes | str) -> str | None:
+    try:
+        request = json.loads(line)
+    except ValueError:
+        error = {"code": -32700, "message": "Parse error"}
+        return json.dumps({"jsonrpc": "2.0", "id": None, "error": error})
+    if not isinstance(request, dict):
+        error = {"code": -32600, "message": "Invalid request"}
+        return json.dumps({"jsonrpc": "2.0", "id": None, "error": error})
+    response = daemon.handle(request)
+    return None if response is None else json.dumps(response)
+
+
+def serve_stdio(daemon: Daemon | None = None, stdin=None, stdout=None):
+    """Answer one request per line of stdin, until EOF or shutdown"""
+    daemon = daemon or Daemon()
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = _respond(daemon, line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+        if not daemon.running:
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                authorised = request.get("token") == self.server.token
+            except (ValueError, AttributeError):
+                authorised = True  # let _respond report the error
+            if authorised:
+                response = _respond(self.server.daemon, line)
+            else:
+                error = {"code": -32001, "message": "Bad token"}
+                response = json.dumps({"jsonrpc": "2.0", "id": None, "error": error})
+            if response is not None:
+                self.wfile.write(response.encode() + b"\n")
+                self.wfile.flush()
+            if not self.server.daemon.running:
+                break
+
+
+class _Server(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0) -> _Server:
+    """A socket server (not yet serving), with its address file written
+
+    Requests are handled one at a time, so CLI invocations never interleave.
+    """
+    server = _Server((host, port), _Handler)
+    server.daemon = Daemon()
+    server.token = secrets.token_hex(16)
+    fn = address_file()
+    os.makedirs(os.path.dirname(fn), exist_ok=True)
+    # only the current user may read the token
+    fd = os.open(fn, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(
+            {
+                "host": server.server_address[0],
+                "port": server.server_address[1],
+                "token": server.token,
+                "pid": os.getpid(),
+            },
+            f,
+        )
+    return server
+
+
+def serve_socket(server: _Server):
+    """Serve until a shutdown request, then remove the address file"""
+    try:
+        while server.daemon.running:
+            server.handle_request()
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(address_file())
+
+
+def request(method: str, params=None, timeout: float | None = None):
+    """Make one request of the running daemon, returning its result
+
+    Raises ConnectionError if there is no daemon to connect to, and RuntimeError
+    if the request failed.
+    """
+    import socket
+
+    try:
+        with open(address_file()) as f:
+            address = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ConnectionError("No projspec daemon running") from e
+    try:
+        sock = socket.create_connection(
+            (address["host"], address["port"]), timeout=timeout
+        )
+    except OSError as e:
+        raise ConnectionError("Cannot connect to projspec daemon") from e
+    msg = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": method,
+        "params": params or {},
+        "token": address["token"],
+    }
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(msg).encode() + b"\n")
+        f.flush()
+        line = f.readline()
+    if not line:
+        raise ConnectionError("projspec daemon closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"]["message"])
+    return response["result"]
+
+
+def forward(args: list[str]) -> int | None:
+    """Run the CLI command in the daemon, if any; returns its exit code
+
+    Returns None if the command was not forwarded, and should run locally.
+    """
+    if not args or args[0] not in forwarded_commands or "--help" in args:
+        return None
+    if os.environ.get("PROJSPEC_NO_DAEMON"):
+        return None
+    try:
+        result = request("run", {"args": args, "cwd": os.getcwd()})
+    except (ConnectionError, OSError, ValueError, RuntimeError):
+        # e.g., a stale address file left by a daemon that died
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["exit_code"]
+
+
+def client_main():
+    """Entry point of the ``projspec`` command: forward to a daemon if possible"""
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from projspec.__main__ import main
+
+    main()
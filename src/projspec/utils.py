@@ -119,7 +119,7 @@ def from_dict(dic, proj=None):
         if "klass" in dic:
             if dic["klass"] == "project":
                 return Project.from_dict(dic)
-            category, name = dic.pop("klass")
+            category, name = dic["klass"]
             try:
                 cls = get_cls(name, category)
             except KeyError:
@@ -128,7 +128,9 @@ def from_dict(dic, proj=None):
                 return cls(dic["value"])
             obj = object.__new__(cls)
             obj.proj = proj
-            obj.__dict__.update({k: from_dict(v, proj=proj) for k, v in dic.items()})
+            obj.__dict__.update(
+                {k: from_dict(v, proj=proj) for k, v in dic.items() if k != "klass"}
+            )
             return obj
         return AttrDict(**{k: from_dict(v, proj=proj) for k, v in dic.items()})
     elif isinstance(dic, list):
@@ -465,14 +467,141 @@ def _ipynb_to_py(data: str) -> str:
     )
 
 
+def _gitignore_regex(pattern: str) -> re.Pattern:
+    """Translate one gitignore glob (without "!" or trailing "/") to a regex"""
+    # a slash at the start or in the middle anchors the pattern to its directory;
+    # otherwise it may match at any depth
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            chars = pattern[i + 1 : end].replace("\\", "\\\\")
+            if chars[0] in "!^":
+                chars = "^" + chars[1:]
+            out.append(f"[{chars}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile(("" if anchored else "(?:.*/)?") + "".join(out))
+
+
+class GitIgnore:
+    """Matches paths against the rules of any number of .gitignore files
+
+    Each file's rules apply to paths below the directory containing it, and later
+    rules (including those of deeper files) override earlier ones, as in git.
+    Instances are compiled once per walk and shared by nested projects.
+    """
+
+    def __init__(self):
+        # (base directory, compiled pattern, negated, directories only)
+        self.rules: list[tuple[str, re.Pattern, bool, bool]] = []
+        self.loaded: set[str] = set()
+
+    def add(self, base: str, text: str) -> None:
+        """Add the rules in ``text``, as found in a .gitignore in directory ``base``"""
+        base = base.rstrip("/")
+        for line in text.splitlines():
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith(("\\#", "\\!")):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                self.rules.append((base, _gitignore_regex(line), negate, dir_only))
+
+    def load(self, fs, path: str) -> None:
+        """Add the rules of the .gitignore in directory ``path``, if not done before"""
+        path = path.rstrip("/")
+        if path in self.loaded:
+            return
+        self.loaded.add(path)
+        try:
+            text = fs.cat_file(f"{path}/.gitignore").decode(errors="ignore")
+        except (OSError, ValueError):
+            return
+        self.add(path, text)
+
+    @classmethod
+    def for_path(cls, fs, path: str) -> "GitIgnore":
+        """Rules applying to ``path`` from the enclosing git repository
+
+        Climbs towards the filesystem root looking for the top of the repository (a
+        directory containing ".git"), and loads ``.git/info/exclude`` and every
+        .gitignore from there down to the parent of ``path``. The .gitignore files
+        at and below ``path`` are loaded as the tree is walked.
+        """
+        ignore = cls()
+        path = path.rstrip("/")
+        chain = [path]
+        try:
+            while not fs.exists(f"{chain[-1]}/.git"):
+                parent = fs._parent(chain[-1]).rstrip("/")
+                if not parent or parent == chain[-1]:
+                    # not within a repository
+                    return ignore
+                chain.append(parent)
+        except Exception:
+            logger.debug("Failed to find repository root of %s", path, exc_info=True)
+            return ignore
+        root = chain[-1]
+        try:
+            ignore.add(root, fs.cat_file(f"{root}/.git/info/exclude").decode())
+        except (OSError, ValueError):
+            pass
+        for directory in reversed(chain[1:]):
+            ignore.load(fs, directory)
+        return ignore
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Whether the given (full) path is ignored"""
+        path = path.rstrip("/")
+        ignored = False
+        for base, regex, negate, dir_only in self.rules:
+            if negate == ignored and (is_dir or not dir_only):
+                if path.startswith(base + "/") and regex.fullmatch(
+                    path[len(base) + 1 :]
+                ):
+                    ignored = not negate
+        return ignored
+
+
 def scan_glob(
     pattern: str,
     *,
     types=None,
     xtypes=None,
-    walk: bool = False,
+    walk: bool | int = False,
     storage_options: str | dict = "",
-    add_to_library: bool = False,
+    add_to_library=False,
+    stop_at_terminal: bool = False,
+    respect_gitignore: bool | None = None,
 ):
     """Scan every directory matching *pattern* and yield a ``Project`` for each.
 
@@ -490,13 +619,22 @@ def scan_glob(
         Spec type names to exclude (list of str, or ``None`` for none).
     walk:
         If ``True``, each matched directory is also walked for child
-        projects (passed through to :class:`projspec.Project`).
+        projects (passed through to :class:`projspec.Project`). If an
+        integer, walk at most that many levels deep.
     storage_options:
         Storage options for remote filesystems.  May be a JSON string or
         a plain ``dict``; an empty string means no options.
     add_to_library:
         If ``True``, each successfully scanned project is added to the
         default project library via :meth:`projspec.Project.add_to_library`.
+        The library file is written once, when the iteration finishes. May
+        also be a :class:`projspec.library.ProjectLibrary` to add to.
+    stop_at_terminal:
+        If ``True``, do not walk below directories matching a terminal spec,
+        such as a python library.
+    respect_gitignore:
+        If ``True``, skip directories and files ignored by git while walking.
+        If ``None``, uses the ``respect_gitignore`` config value.
 
     Yields
     ------
@@ -538,31 +676,44 @@ def scan_glob(
     if not candidates:
         candidates = [path]
 
-    for candidate in candidates:
-        try:
-            if fs.info(candidate)["type"] != "directory":
+    library = None
+    if add_to_library:
+        from projspec.library import ProjectLibrary
+
+        library = (
+            add_to_library
+            if isinstance(add_to_library, ProjectLibrary)
+            else ProjectLibrary()
+        )
+    # with a library, write it once at the end rather than once per project
+    with library.transaction() if library is not None else contextlib.nullcontext():
+        for candidate in candidates:
+            try:
+                if fs.info(candidate)["type"] != "directory":
+                    continue
+            except FileNotFoundError:
+                logger.warning("Path not found: %s", candidate)
                 continue
-        except FileNotFoundError:
-            logger.warning("Path not found: %s", candidate)
-            continue
-        try:
-            proj = Project(
-                candidate,
-                fs=fs,
-                types=types,
-                xtypes=xtypes,
-                walk=walk,
-            )
-        except Exception:
-            logger.warning("Failed to scan %s", candidate, exc_info=True)
-            continue
-        if not proj:
-            continue
-        if add_to_library:
             try:
-                proj.add_to_library()
-            except TypeError:
-                import warnings
-
-                warnings.warn(f"{repr(proj)} failed to serialise")
-        yield proj
+                proj = Project(
+                    candidate,
+                    fs=fs,
+                    types=types,
+                    xtypes=xtypes,
+                    walk=walk,
+                    stop_at_terminal=stop_at_terminal,
+                    gitignore=respect_gitignore,
+                )
+            except Exception:
+                logger.warning("Failed to scan %s", candidate, exc_info=True)
+                continue
+            if not proj:
+                continue
+            if add_to_library:
+                try:
+                    proj.add_to_library(library=library)
+                except TypeError:
+                    import warnings
+
+                    warnings.warn(f"{repr(proj)} failed to serialise")
+            yield proj
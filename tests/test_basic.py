@@ -229,3 +229,261 @@ def test_tree_stats_with_list_yielding_walk(tmp_path):
     finally:
         # remove the instance override so the shared (cached) fs is clean
         del proj2.fs.walk
+
+
+def _tree_summary(proj):
+    return [(k, sorted(v.specs)) for k, v in proj.children.items()]
+
+
+def test_parallel_children_match_serial(proj):
+    from projspec.config import temp_conf
+
+    with temp_conf(scan_workers=4):
+        proj2 = projspec.Project(proj.url, walk=True)
+    # same children, in the same (deterministic) order
+    assert _tree_summary(proj2) == _tree_summary(proj)
+
+
+def test_parallel_children_shared_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    import fsspec
+
+    mfs = fsspec.filesystem("memory")
+    try:
+        mfs.rm("/par", recursive=True)
+    except FileNotFoundError:
+        pass
+    for i in range(5):
+        for j in range(3):
+            mfs.pipe(
+                f"/par/p{i}/sub{j}/pyproject.toml",
+                b'[project]\nname="x"\nversion="0.1"\n',
+            )
+    try:
+        serial = projspec.Project("memory://par", walk=True)
+        # a single worker exercises the caller-runs path for nested children
+        with ThreadPoolExecutor(1) as pool:
+            parallel = projspec.Project("memory://par", walk=True, executor=pool)
+        assert len(serial.children) == 15
+        assert _tree_summary(parallel) == _tree_summary(serial)
+    finally:
+        mfs.rm("/par", recursive=True)
+
+
+def test_walk_lists_each_directory_once():
+    """Walking and computing tree stats share one listing of the tree."""
+    from collections import Counter
+
+    import fsspec
+
+    mfs = fsspec.filesystem("memory")
+    try:
+        mfs.rm("/once", recursive=True)
+    except FileNotFoundError:
+        pass
+    mfs.pipe("/once/pyproject.toml", b'[project]\nname="x"\nversion="0.1"\n')
+    mfs.pipe("/once/a/pyproject.toml", b'[project]\nname="a"\nversion="0.1"\n')
+    mfs.pipe("/once/a/b/data.txt", b"hello")
+    mfs.pipe("/once/node_modules/big.js", b"x" * 9999)
+
+    calls = Counter()
+    orig_ls = type(mfs).ls
+
+    def counting_ls(self, path, *args, **kwargs):
+        calls[path.rstrip("/")] += 1
+        return orig_ls(self, path, *args, **kwargs)
+
+    mfs.ls = counting_ls.__get__(mfs, type(mfs))
+    try:
+        proj = projspec.Project("memory://once", walk=True)
+        assert proj.file_count == 3
+        assert proj.children["a"].file_count == 2
+        assert proj.children["a"].total_size == proj.total_size - len(
+            b'[project]\nname="x"\nversion="0.1"\n'
+        )
+        # every directory listed exactly once; excluded ones never
+        assert set(calls.values()) == {1}
+        assert "/once/node_modules" not in calls
+    finally:
+        del mfs.ls
+        mfs.rm("/once", recursive=True)
+
+
+def test_marker_index_skips_unmarked_specs(monkeypatch):
+    import fsspec
+
+    from projspec.proj.base import _marker_index
+    from projspec.proj.golang import Golang
+
+    index = _marker_index()
+    assert "golang" not in index.always
+    assert "golang" in index.candidates(["go.mod", "README.md"])
+    assert "golang" not in index.candidates(["pyproject.toml"])
+    # suffix markers
+    assert "terraform" in index.candidates(["main.tf"])
+    # specs with no declared markers are always candidates
+    assert "data_project" in index.candidates([])
+
+    mfs = fsspec.filesystem("memory")
+    mfs.pipe("/markers/pyproject.toml", b'[project]\nname="x"\nversion="0.1"\n')
+    made = []
+    monkeypatch.setattr(
+        Golang, "__init__", lambda self, proj: made.append(proj) or 1 / 0
+    )
+    try:
+        proj = projspec.Project("memory://markers", walk=False)
+        assert "python_library" in proj.specs
+        assert not made
+    finally:
+        mfs.rm("/markers", recursive=True)
+
+
+def test_marker_index_same_result_as_all_specs(proj, monkeypatch):
+    from projspec.proj import base
+
+    monkeypatch.setattr(
+        base._MarkerIndex, "candidates", lambda self, basenames: self.order
+    )
+    proj2 = projspec.Project(proj.url, walk=True)
+    assert sorted(proj2.specs) == sorted(proj.specs)
+    assert sorted(proj2.contents) == sorted(proj.contents)
+    assert _tree_summary(proj2) == _tree_summary(proj)
+
+
+@pytest.fixture
+def deep_tree():
+    import fsspec
+
+    mfs = fsspec.filesystem("memory")
+    try:
+        mfs.rm("/deep", recursive=True)
+    except FileNotFoundError:
+        pass
+    pyproject = b'[project]\nname="x"\nversion="0.1"\n'
+    for path in ["a", "a/b", "a/b/c", "x/y"]:
+        mfs.pipe(f"/deep/{path}/pyproject.toml", pyproject)
+    yield "memory://deep"
+    mfs.rm("/deep", recursive=True)
+
+
+@pytest.mark.parametrize(
+    "walk,expected",
+    [
+        (0, []),
+        (1, ["a"]),
+        (2, ["a", "a/b", "x/y"]),
+        (3, ["a", "a/b", "a/b/c", "x/y"]),
+        (True, ["a", "a/b", "a/b/c", "x/y"]),
+    ],
+)
+def test_walk_depth(deep_tree, walk, expected):
+    def nested(proj, prefix=""):
+        for k, v in proj.children.items():
+            yield prefix + k
+            yield from nested(v, f"{prefix}{k}/")
+
+    proj = projspec.Project(deep_tree, walk=walk)
+    assert sorted(nested(proj)) == expected
+
+
+def test_walk_stop_at_terminal(deep_tree):
+    proj = projspec.Project(deep_tree, walk=True, stop_at_terminal=True)
+    # "a" is a python library, so its subdirectories are not scanned
+    assert sorted(proj.children) == ["a", "x/y"]
+    assert not proj.children["a"].children
+
+
+def test_gitignore_rules():
+    from projspec.utils import GitIgnore
+
+    ignore = GitIgnore()
+    ignore.add(
+        "/r",
+        "# comment\n*.log\n!keep.log\n/out\nbuild/\ndocs/**/gen\nsub/*.tmp\n",
+    )
+    ignore.add("/r/sub", "local\n")
+    assert ignore.match("/r/x.log")
+    assert ignore.match("/r/a/b/x.log")
+    assert not ignore.match("/r/keep.log")
+    assert ignore.match("/r/out", is_dir=True)
+    assert not ignore.match("/r/a/out", is_dir=True)
+    assert ignore.match("/r/a/build", is_dir=True)
+    assert not ignore.match("/r/a/build")  # directory-only rule
+    assert ignore.match("/r/docs/gen", is_dir=True)
+    assert ignore.match("/r/docs/a/b/gen", is_dir=True)
+    assert ignore.match("/r/sub/x.tmp")
+    assert not ignore.match("/r/sub/deeper/x.tmp")
+    assert ignore.match("/r/sub/a/local", is_dir=True)
+    assert not ignore.match("/r/local", is_dir=True)
+    assert not ignore.match("/other/x.log")
+
+
+def test_walk_respects_gitignore():
+    import fsspec
+
+    mfs = fsspec.filesystem("memory")
+    try:
+        mfs.rm("/gi", recursive=True)
+    except FileNotFoundError:
+        pass
+    pyproject = b'[project]\nname="x"\nversion="0.1"\n'
+    mfs.pipe("/gi/.git/HEAD", b"ref: refs/heads/main\n")
+    mfs.pipe("/gi/.gitignore", b"generated/\n*.log\n")
+    mfs.pipe("/gi/repo/a/pyproject.toml", pyproject)
+    mfs.pipe("/gi/repo/generated/pyproject.toml", pyproject)
+    mfs.pipe("/gi/repo/vendored/lib/pyproject.toml", pyproject)
+    mfs.pipe("/gi/repo/vendored/.gitignore", b"lib/\n")
+    mfs.pipe("/gi/repo/run.log", b"x" * 1000)
+    try:
+        proj = projspec.Project("memory://gi/repo", walk=True)
+        assert sorted(proj.children) == ["a", "generated", "vendored/lib"]
+        assert proj.file_count == 5
+
+        # rules of the enclosing repository root also apply
+        proj = projspec.Project("memory://gi/repo", walk=True, gitignore=True)
+        assert sorted(proj.children) == ["a"]
+        assert proj.file_count == 2  # a/pyproject.toml and vendored/.gitignore
+        assert proj.children["a"].gitignore is proj.gitignore
+
+        with projspec.config.temp_conf(respect_gitignore=True):
+            proj = projspec.Project("memory://gi/repo", walk=True)
+        assert sorted(proj.children) == ["a"]
+    finally:
+        mfs.rm("/gi", recursive=True)
+
+
+def test_scan_cache(tmp_path, monkeypatch):
+    import fsspec
+
+    from projspec.proj.python_code import PythonLibrary
+
+    monkeypatch.setenv("PROJSPEC_CONFIG_DIR", str(tmp_path))
+    mfs = fsspec.filesystem("memory")
+    mfs.pipe("/cached/pyproject.toml", b'[project]\nname="x"\nversion="0.1"\n')
+    mfs.pipe("/cached/a/pyproject.toml", b'[project]\nname="a"\nversion="0.1"\n')
+    try:
+        proj = projspec.Project("memory://cached", walk=True, scan_cache=True)
+        assert "python_library" in proj.specs
+        assert list((tmp_path / "scan_cache").iterdir())
+
+        parsed = []
+        orig = PythonLibrary.parse
+        monkeypatch.setattr(
+            PythonLibrary, "parse", lambda self: parsed.append(self) or orig(self)
+        )
+        proj2 = projspec.Project("memory://cached", walk=True, scan_cache=True)
+        assert not parsed
+        for p1, p2 in [(proj, proj2), (proj.children.a, proj2.children.a)]:
+            assert p2.to_dict()["specs"] == p1.to_dict()["specs"]
+        assert proj2.specs.python_library.proj is proj2
+
+        # only the changed directory is parsed again
+        mfs.pipe("/cached/a/pyproject.toml", b'[project]\nname="b"\nversion="0.1"\n')
+        proj3 = projspec.Project("memory://cached", walk=True, scan_cache=True)
+        assert [_.proj.url for _ in parsed] == ["/cached/a"]
+        assert proj3.children.a.to_dict()["specs"]["python_library"]["_contents"][
+            "python_package"
+        ] == {"package_name": "b"}
+    finally:
+        mfs.rm("/cached", recursive=True)
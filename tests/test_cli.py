@@ -14,6 +14,17 @@ def test1(capsys):
     assert capsys.readouterr().out.startswith("{")
 
 
+def test_scan_depth(capsys):
+    main(["scan", "--depth", "1", "--summary"], standalone_mode=False)
+    out = capsys.readouterr().out
+    assert " tests:" in out
+    # the package itself is two levels down
+    assert "src/projspec:" not in out
+
+    main(["scan", "--depth", "2", "--summary"], standalone_mode=False)
+    assert "src/projspec:" in capsys.readouterr().out
+
+
 def test_help(capsys):
     main(["--help"], standalone_mode=False)
     assert "Options:" in capsys.readouterr().out
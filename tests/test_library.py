@@ -1,6 +1,7 @@
 import json
 import os
 import time
+from contextlib import closing
 
 from projspec import Project
 from projspec.config import temp_conf
@@ -128,3 +129,208 @@ def test_auto_rescan_disabled_with_zero(tmp_path):
         library = ProjectLibrary(fn)
     # the very old entry is kept as-is, never rescanned
     assert abs(library.entries[key].scanned_at - old) < 1
+
+
+def test_transaction_saves_once(tmp_path, monkeypatch):
+    fn = str(tmp_path / "library.json")
+    library = ProjectLibrary(fn)
+    saves = []
+    orig = ProjectLibrary.save
+    monkeypatch.setattr(
+        ProjectLibrary, "save", lambda self: saves.append(1) or orig(self)
+    )
+
+    proj = Project(root)
+    with library.transaction():
+        for i in range(5):
+            library.add_entry(f"key{i}", proj)
+        with library.transaction():
+            library.add_entry("nested", proj)
+        assert not saves
+        assert not os.path.exists(fn)
+    assert len(saves) == 1
+    assert sorted(json.load(open(fn))) == [
+        "key0",
+        "key1",
+        "key2",
+        "key3",
+        "key4",
+        "nested",
+    ]
+
+    # no changes, no write
+    with library.transaction():
+        pass
+    assert len(saves) == 1
+
+
+def test_save_reuses_unchanged_entries(tmp_path, monkeypatch):
+    fn = str(tmp_path / "library.json")
+    library = ProjectLibrary(fn)
+    library.add_entry("a", Project(root))
+    library.add_entry("b", Project(here))
+
+    library = ProjectLibrary(fn)
+    serialised = []
+    orig = Project.to_dict
+    monkeypatch.setattr(
+        Project,
+        "to_dict",
+        lambda self, **kw: serialised.append(self) or orig(self, **kw),
+    )
+    library.add_entry("c", Project(here))
+    # only the new entry was serialised
+    assert serialised == [library.entries["c"]]
+
+    # in-place rescans are noticed
+    library.entries["a"].resolve()
+    del library.entries["b"]
+    library.save()
+    assert serialised[1:] == [library.entries["a"]]
+    assert sorted(json.load(open(fn))) == ["a", "c"]
+
+
+def test_sqlite_library(tmp_path):
+    import sqlite3
+
+    from projspec.library import SQLiteStore
+
+    fn = str(tmp_path / "library.db")
+    library = ProjectLibrary(fn)
+    assert isinstance(library.store, SQLiteStore)
+    with library.transaction():
+        library.add_entry("root", Project(root, walk=True))
+        library.add_entry("tests", Project(here))
+
+    library = ProjectLibrary(fn)
+    assert sorted(library.entries) == ["root", "tests"]
+    assert "python_library" in library.get("root").specs
+
+    jlib = ProjectLibrary(None, auto_save=False)
+    for key, proj in library.entries.items():
+        jlib.add_entry(key, proj)
+    for filters in (
+        [],
+        [("spec", "python_library")],
+        [("spec", "PythonLibrary"), ("artifact", "wheel")],
+        [("content", "environment")],
+        [("spec", ("xx", "git_repo"))],
+        [("spec", "xx")],
+    ):
+        assert library.filter(filters).keys() == jlib.filter(filters).keys()
+
+    library.delete("tests")
+    with closing(sqlite3.connect(fn)) as con:
+        assert con.execute("SELECT key FROM projects").fetchall() == [("root",)]
+        assert {_[0] for _ in con.execute("SELECT key FROM terms")} == {"root"}
+    assert list(ProjectLibrary(fn).entries) == ["root"]
+    library.clear()
+    assert not os.path.exists(fn)
+
+
+def test_lazy_entries(tmp_path, monkeypatch):
+    from projspec.library import LazyEntries
+
+    fn = str(tmp_path / "library.json")
+    library = ProjectLibrary(fn)
+    with library.transaction():
+        library.add_entry("root", Project(root, walk=True))
+        library.add_entry("tests", Project(here))
+    summaries = {k: v.text_summary(bare=True) for k, v in library.entries.items()}
+
+    hydrated = []
+    orig = Project.from_dict
+    monkeypatch.setattr(
+        Project, "from_dict", staticmethod(lambda d: hydrated.append(d) or orig(d))
+    )
+    library = ProjectLibrary(fn)
+    assert isinstance(library.entries, LazyEntries)
+    assert sorted(library.entries) == ["root", "tests"]
+    assert "root" in library.entries
+    assert {k: library.entries.summary(k) for k in library.entries} == summaries
+    assert library.entries.raw("tests")["url"] == library.entries.saved["tests"]["url"]
+    assert not hydrated
+
+    library.add_entry("other", Project(here))
+    assert not hydrated
+    assert library.entries["root"].specs
+    # only this entry (and its children) were hydrated
+    assert hydrated[0] is library.entries.saved["root"]
+    assert not library.entries.is_hydrated("tests")
+    assert json.load(open(fn)).keys() == {"root", "tests", "other"}
+
+
+def test_cli_list_does_not_hydrate(tmp_path, monkeypatch, capsys):
+    from projspec.__main__ import main
+
+    fn = str(tmp_path / "library.json")
+    ProjectLibrary(fn).add_entry("tests", Project(here))
+    monkeypatch.setattr(Project, "from_dict", None)
+    with temp_conf(library_path=fn):
+        main(["library", "list"], standalone_mode=False)
+        main(["library", "list", "--json-out"], standalone_mode=False)
+    out = capsys.readouterr().out.splitlines()
+    assert "/tests /: " in out[0]
+    assert json.loads(out[-1]).keys() == {"tests"}
+
+
+def _stale_library(tmp_path, names):
+    fn = str(tmp_path / "library.json")
+    library = ProjectLibrary(fn)
+    with library.transaction():
+        for name in names:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "__init__.py").write_text("x = 1\n")
+            library.add_entry(name, Project(str(tmp_path / name), walk=False))
+    data = json.load(open(fn))
+    for entry in data.values():
+        entry["scanned_at"] = time.time() - 1000
+    json.dump(data, open(fn, "w"))
+    return fn
+
+
+def test_auto_rescan_timeout(tmp_path, monkeypatch):
+    import projspec.library
+
+    fn = _stale_library(tmp_path, ["fast", "slow"])
+
+    class SlowProject(Project):
+        def __init__(self, path, **kwargs):
+            if path.endswith("slow"):
+                time.sleep(3)
+            super().__init__(path, **kwargs)
+
+    monkeypatch.setattr(projspec.library, "Project", SlowProject)
+    start = time.time()
+    with temp_conf(auto_rescan=10, auto_rescan_timeout=0.5):
+        library = ProjectLibrary(fn)
+    assert time.time() - start < 2
+    # the slow one was abandoned, keeping its stored data
+    assert library.entries["fast"].scanned_at > time.time() - 5
+    assert library.entries["slow"].scanned_at < time.time() - 500
+
+
+def test_auto_rescan_background(tmp_path, monkeypatch):
+    import threading
+
+    import projspec.library
+
+    fn = _stale_library(tmp_path, ["a", "b"])
+    go = threading.Event()
+
+    class BlockedProject(Project):
+        def __init__(self, path, **kwargs):
+            go.wait(5)
+            super().__init__(path, **kwargs)
+
+    monkeypatch.setattr(projspec.library, "Project", BlockedProject)
+    with temp_conf(auto_rescan=10):
+        library = ProjectLibrary(fn, background_rescan=True)
+        # returned with the stored data
+        assert library.entries.scanned_at("a") < time.time() - 500
+        assert not library.wait_rescan(0.1)
+        go.set()
+        assert library.wait_rescan(5)
+    assert library.entries["a"].scanned_at > time.time() - 5
+    assert library.entries["b"].scanned_at > time.time() - 5
+    assert float(json.load(open(fn))["a"]["scanned_at"]) > time.time() - 5
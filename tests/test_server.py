@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import threading
+
+import pytest
+
+from projspec import server
+
+here = os.path.dirname(__file__)
+
+
+@pytest.fixture
+def conf(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJSPEC_CONFIG_DIR", str(tmp_path))
+    monkeypatch.setenv("PROJSPEC_LIBRARY_PATH", str(tmp_path / "library.json"))
+    return tmp_path
+
+
+def _stdio(*requests):
+    stdin = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    stdout = io.StringIO()
+    server.serve_stdio(stdin=stdin, stdout=stdout)
+    return [json.loads(_) for _ in stdout.getvalue().splitlines()]
+
+
+def test_stdio(conf):
+    out = _stdio(
+        {"jsonrpc": "2.0", "id": 1, "method": "ping"},
+        {"jsonrpc": "2.0", "id": 2, "method": "info"},
+        {"jsonrpc": "2.0", "id": 3, "method": "nope"},
+        {"jsonrpc": "2.0", "id": 4, "method": "library_delete", "params": {"x": 1}},
+        {"jsonrpc": "2.0", "id": 5, "method": "scan", "params": [[here], False, True]},
+        {"jsonrpc": "2.0", "id": 6, "method": "library_list"},
+        {"jsonrpc": "2.0", "id": 7, "method": "run", "params": {"args": ["version"]}},
+        {"jsonrpc": "2.0", "id": 8, "method": "shutdown"},
+        {"jsonrpc": "2.0", "id": 9, "method": "ping"},
+    )
+    assert [_["id"] for _ in out] == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert out[0]["result"] == "pong"
+    assert "python_library" in out[1]["result"]["specs"]
+    assert out[2]["error"]["code"] == -32601
+    assert out[3]["error"]["code"] == -32602
+    assert [_["url"] for _ in out[4]["result"]] == [f"file://{here}"]
+    assert list(out[5]["result"]) == [f"file://{here}"]
+    assert out[6]["result"]["exit_code"] == 0
+    assert "projspec version" in out[6]["result"]["stdout"]
+
+
+def test_socket_and_forward(conf, capsys, monkeypatch):
+    srv = server.make_server()
+    assert oct(os.stat(server.address_file()).st_mode & 0o777) == "0o600"
+    thread = threading.Thread(target=server.serve_socket, args=(srv,))
+    thread.start()
+    try:
+        assert server.request("ping", timeout=5) == "pong"
+
+        monkeypatch.chdir(here)
+        assert server.forward(["scan", "--library", "--summary"]) == 0
+        assert "tests /:" in capsys.readouterr().out
+        assert server.forward(["library", "list"]) == 0
+        assert f"file://{here}" in capsys.readouterr().out
+        assert server.forward(["library", "delete", "nope"]) == 1
+        assert "KeyError" in capsys.readouterr().err
+        # not forwarded
+        assert server.forward(["config", "show"]) is None
+        assert server.forward(["scan", "--help"]) is None
+
+        with open(server.address_file()) as f:
+            address = json.load(f)
+        address["token"] = "wrong"
+        with open(server.address_file(), "w") as f:
+            json.dump(address, f)
+        with pytest.raises(RuntimeError):
+            server.request("ping", timeout=5)
+        # falls back to running locally
+        assert server.forward(["version"]) is None
+    finally:
+        srv.token = address["token"] = json.load(open(server.address_file()))["token"]
+        srv.daemon.running = False
+        server.request("ping", timeout=5)
+        thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(server.address_file())
+    assert server.forward(["version"]) is None